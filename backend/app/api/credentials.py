@@ -5,13 +5,14 @@ Endpoints: /api/credentials
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from app.services.credential_vault import CredentialVault
-from app.services.supabase_client import get_supabase_client
+from app.services.supabase_client import get_async_supabase_client
 
 router = APIRouter(prefix="/api/credentials", tags=["credentials"])
 
@@ -31,8 +32,22 @@ class CredentialResponse(BaseModel):
     created_at: str
 
 
+def _credential_response(row: dict[str, Any]) -> dict[str, Any]:
+    """Strip a credentials row down to its public metadata."""
+    return {
+        "id": row["id"],
+        "service_name": row["service_name"],
+        "credential_name": row["credential_name"],
+        "created_at": row["created_at"],
+    }
+
+
 @router.post("/", response_model=CredentialResponse, status_code=201)
-async def create_credential(credential: CredentialCreate, user_id: str = "system") -> dict[str, Any]:
+async def create_credential(
+    credential: CredentialCreate,
+    user_id: str = "system",
+    supabase: Any = Depends(get_async_supabase_client),
+) -> dict[str, Any]:
     """
     Store a new encrypted credential.
 
@@ -40,10 +55,9 @@ async def create_credential(credential: CredentialCreate, user_id: str = "system
     The plain key is never stored or returned.
     """
     vault = CredentialVault()
-    supabase = get_supabase_client()
 
-    # Encrypt the API key
-    encrypted_key = vault.encrypt_credential(credential.api_key)
+    # Encrypt the API key off the event loop (Fernet HMAC + AES is CPU-bound)
+    encrypted_key = await asyncio.to_thread(vault.encrypt_credential, credential.api_key)
 
     # Store in database
     row = {
@@ -53,29 +67,25 @@ async def create_credential(credential: CredentialCreate, user_id: str = "system
         "user_id": user_id,
     }
 
-    response = supabase.table("credentials").insert(row).execute()
+    response = await supabase.table("credentials").insert(row).execute()
 
     if not response.data:
         raise HTTPException(status_code=500, detail="Failed to create credential")
 
-    return {
-        "id": response.data[0]["id"],
-        "service_name": response.data[0]["service_name"],
-        "credential_name": response.data[0]["credential_name"],
-        "created_at": response.data[0]["created_at"],
-    }
+    return _credential_response(response.data[0])
 
 
 @router.get("/", response_model=list[CredentialResponse])
-async def list_credentials(user_id: str = "system") -> list[dict[str, Any]]:
+async def list_credentials(
+    user_id: str = "system",
+    supabase: Any = Depends(get_async_supabase_client),
+) -> list[dict[str, Any]]:
     """
     List credentials for a user (without API keys).
 
     Returns credential metadata only, never the encrypted or plain keys.
     """
-    supabase = get_supabase_client()
-
-    response = supabase.table("credentials").select(
+    response = await supabase.table("credentials").select(
         "id, service_name, credential_name, created_at"
     ).eq("user_id", user_id).order("created_at", desc=True).execute()
 
@@ -83,22 +93,27 @@ async def list_credentials(user_id: str = "system") -> list[dict[str, Any]]:
 
 
 @router.delete("/{credential_id}", status_code=204)
-async def delete_credential(credential_id: str, user_id: str = "system") -> None:
+async def delete_credential(
+    credential_id: str,
+    user_id: str = "system",
+    supabase: Any = Depends(get_async_supabase_client),
+) -> None:
     """Delete a credential by ID, scoped to user."""
-    supabase = get_supabase_client()
-
     # Check if exists
-    existing = supabase.table("credentials").select("id").eq("id", credential_id).execute()
+    existing = await supabase.table("credentials").select("id").eq("id", credential_id).execute()
 
     if not existing.data:
         raise HTTPException(status_code=404, detail="Credential not found")
 
     # Delete (scoped to user for safety)
-    supabase.table("credentials").delete().eq("id", credential_id).eq("user_id", user_id).execute()
+    await supabase.table("credentials").delete().eq("id", credential_id).eq("user_id", user_id).execute()
 
 
 @router.get("/{credential_id}/decrypt")
-async def decrypt_credential(credential_id: str) -> dict[str, str]:
+async def decrypt_credential(
+    credential_id: str,
+    supabase: Any = Depends(get_async_supabase_client),
+) -> dict[str, str]:
     """
     Decrypt a credential for runtime use.
 
@@ -106,14 +121,14 @@ async def decrypt_credential(credential_id: str) -> dict[str, str]:
     Should only be called server-side, never exposed to frontend.
     """
     vault = CredentialVault()
-    supabase = get_supabase_client()
 
-    response = supabase.table("credentials").select("encrypted_key").eq("id", credential_id).execute()
+    response = await supabase.table("credentials").select("encrypted_key").eq("id", credential_id).execute()
 
     if not response.data:
         raise HTTPException(status_code=404, detail="Credential not found")
 
+    # Decrypt off the event loop (Fernet HMAC + AES is CPU-bound)
     encrypted_key = response.data[0]["encrypted_key"]
-    plain_key = vault.decrypt_credential(encrypted_key)
+    plain_key = await asyncio.to_thread(vault.decrypt_credential, encrypted_key)
 
     return {"api_key": plain_key}
@@ -3,10 +3,12 @@ Export API endpoints.
 
 Converts workflows to various formats (Python, JavaScript, etc.).
 """
-from fastapi import APIRouter, HTTPException
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import PlainTextResponse
 
-from app.services.supabase_client import get_supabase_client
+from app.services.supabase_client import get_async_supabase_client
 from app.services.python_exporter import PythonExporter
 from app.models.flow import FlowDefinition
 
@@ -14,7 +16,7 @@ router = APIRouter(prefix="/api/flows", tags=["export"])
 
 
 @router.get("/{flow_id}/export/python", response_class=PlainTextResponse)
-async def export_python(flow_id: str):
+async def export_python(flow_id: str, supabase: Any = Depends(get_async_supabase_client)):
     """
     Export workflow as Python script.
 
@@ -29,8 +31,7 @@ async def export_python(flow_id: str):
         500: Export generation failed
     """
     # Fetch flow from database
-    supabase = get_supabase_client()
-    result = supabase.table("flows").select("*").eq("id", flow_id).execute()
+    result = await supabase.table("flows").select("*").eq("id", flow_id).execute()
 
     if not result.data or len(result.data) == 0:
         raise HTTPException(status_code=404, detail="Flow not found")
@@ -39,7 +40,7 @@ async def export_python(flow_id: str):
 
     # Parse as FlowDefinition
     try:
-        flow = FlowDefinition(**flow_data)
+        flow = FlowDefinition.model_validate(flow_data)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to parse flow definition: {str(e)}"
@@ -5,15 +5,48 @@ Endpoints: /api/flows
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import uuid
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import JSONResponse
 
+from app.api.responses import RawJSONResponse
+from app.compiler.flow_compiler import default_compiler
 from app.models.flow import FlowDefinition
-from app.services.supabase_client import get_supabase_client
+from app.services.supabase_client import get_async_supabase_client
 
 router = APIRouter(prefix="/api/flows", tags=["flows"])
 
+# ---------------------------------------------------------------------------
+# Read-through cache (bounded, short-lived; invalidated on every mutation)
+# ---------------------------------------------------------------------------
+
+# Entries are (payload, etag) so conditional GETs can be answered from cache.
+_flow_cache: TTLCache[str, tuple[FlowDefinition, str]] = TTLCache(maxsize=1024, ttl=60)
+_list_cache: TTLCache[Optional[str], tuple[list[FlowDefinition], str]] = TTLCache(maxsize=64, ttl=5)
+_cache_lock = asyncio.Lock()
+# Bumped on every mutation so reads that raced a write don't repopulate stale rows.
+_cache_generation = 0
+
+
+async def invalidate_flow(flow_id: str) -> None:
+    """Drop cached reads of a flow; call after every write to the flows table."""
+    global _cache_generation
+    async with _cache_lock:
+        _cache_generation += 1
+        _flow_cache.pop(flow_id, None)
+        _list_cache.clear()
+
+
+async def _cache_store(cache: TTLCache, key: Any, value: Any, generation: int) -> None:
+    async with _cache_lock:
+        if generation == _cache_generation:
+            cache[key] = value
+
 
 def _flow_from_db_row(row: dict[str, Any]) -> FlowDefinition:
     """Convert Supabase row to FlowDefinition"""
@@ -35,124 +68,190 @@ def _flow_from_db_row(row: dict[str, Any]) -> FlowDefinition:
     )
 
 
-@router.get("/", response_model=list[FlowDefinition])
-async def list_flows(user_id: Optional[str] = None) -> list[FlowDefinition]:
-    """List all saved flows, optionally filtered by user_id."""
-    supabase = get_supabase_client()
+def _flow_to_db_row(flow: FlowDefinition) -> dict[str, Any]:
+    """Convert FlowDefinition to the mutable Supabase columns (one model dump)"""
+    row = flow.model_dump(mode='json', exclude={"id"})
+    row["description"] = row["description"] or ""
+    # NodeConfig carries one populated sub-config per node; store only that one
+    # so reloading the flow doesn't re-validate a dozen explicit nulls per node
+    for node in row["nodes"]:
+        node["config"] = {k: v for k, v in node["config"].items() if v is not None}
+    return row
+
 
-    query = supabase.table("flows").select("*").order("created_at", desc=True)
+def _owned_by(query: Any, user_id: Optional[str]) -> Any:
+    """Restrict a mutation to rows the caller may touch (theirs or unowned)."""
     if user_id:
-        query = query.eq("user_id", user_id)
-    response = query.execute()
+        # Owners are Supabase auth UUIDs; the canonical form is safe to splice
+        # into the PostgREST filter (no commas, quotes or parentheses)
+        try:
+            owner = str(uuid.UUID(user_id))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="user_id must be a UUID")
+        query = query.or_(f'user_id.is.null,user_id.eq."",user_id.eq.{owner}')
+    return query
+
+
+async def _raise_missing_or_forbidden(supabase: Any, flow_id: str, forbidden_detail: str) -> None:
+    """A mutation matched no rows: report 404 if the flow is gone, else 403."""
+    existing = await supabase.table("flows").select("id").eq("id", flow_id).execute()
+    if not existing.data:
+        raise HTTPException(status_code=404, detail="Flow not found")
+    raise HTTPException(status_code=403, detail=forbidden_detail)
 
-    return [_flow_from_db_row(row) for row in response.data]
 
+def _row_etag(*rows: dict[str, Any]) -> str:
+    """Strong ETag derived from each row's id and updated_at."""
+    digest = hashlib.blake2b(digest_size=8)
+    for row in rows:
+        digest.update(f"{row['id']}:{row['updated_at']};".encode())
+    return f'"{digest.hexdigest()}"'
 
-@router.get("/{flow_id}", response_model=FlowDefinition)
-async def get_flow(flow_id: str) -> FlowDefinition:
-    """Get a single flow by ID."""
-    supabase = get_supabase_client()
 
-    response = supabase.table("flows").select("*").eq("id", flow_id).execute()
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+async def _load_flow(
+    flow_id: str,
+    supabase: Any,
+    if_none_match: Optional[str] = None,
+) -> tuple[Optional[FlowDefinition], str]:
+    """
+    Fetch a flow (through the cache) together with its ETag.
+
+    When the row's ETag matches ``if_none_match`` the flow is not built and
+    ``None`` is returned in its place.
+    """
+    cached = _flow_cache.get(flow_id)
+    if cached is not None:
+        return cached
+
+    generation = _cache_generation
+    response = await supabase.table("flows").select("*").eq("id", flow_id).execute()
 
     if not response.data:
         raise HTTPException(status_code=404, detail="Flow not found")
 
-    return _flow_from_db_row(response.data[0])
+    row = response.data[0]
+    etag = _row_etag(row)
+    if _etag_matches(if_none_match, etag):
+        return None, etag
+
+    entry = (_flow_from_db_row(row), etag)
+    await _cache_store(_flow_cache, flow_id, entry, generation)
+    return entry
+
+
+@router.get("/", response_model=list[FlowDefinition])
+async def list_flows(
+    response: Response,
+    user_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+    supabase: Any = Depends(get_async_supabase_client),
+) -> Any:
+    """List all saved flows, optionally filtered by user_id."""
+    cached = _list_cache.get(user_id)
+    if cached is not None:
+        flows, etag = cached
+    else:
+        generation = _cache_generation
+        query = supabase.table("flows").select("*").order("created_at", desc=True)
+        if user_id:
+            query = query.eq("user_id", user_id)
+        result = await query.execute()
+
+        etag = _row_etag(*result.data)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+
+        flows = [_flow_from_db_row(row) for row in result.data]
+        await _cache_store(_list_cache, user_id, (flows, etag), generation)
+
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    return flows
+
+
+@router.get("/{flow_id}", response_model=FlowDefinition)
+async def get_flow(
+    flow_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    supabase: Any = Depends(get_async_supabase_client),
+) -> Any:
+    """Get a single flow by ID."""
+    flow, etag = await _load_flow(flow_id, supabase, if_none_match)
+    if flow is None or _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    return flow
 
 
 @router.post("/", response_model=FlowDefinition, status_code=201)
-async def create_flow(flow: FlowDefinition) -> FlowDefinition:
+async def create_flow(flow: FlowDefinition, supabase: Any = Depends(get_async_supabase_client)) -> FlowDefinition:
     """Create a new flow."""
-    supabase = get_supabase_client()
-
-    # Check if flow already exists
-    existing = supabase.table("flows").select("id").eq("id", flow.id).execute()
-    if existing.data:
+    # Insert unless the ID is taken; a conflicting row comes back as no data
+    row = {"id": flow.id, **_flow_to_db_row(flow)}
+    response = await (
+        supabase.table("flows")
+        .upsert(row, on_conflict="id", ignore_duplicates=True)
+        .execute()
+    )
+    if not response.data:
         raise HTTPException(status_code=409, detail="Flow with this ID already exists")
-
-    # Insert new flow
-    row = {
-        "id": flow.id,
-        "name": flow.name,
-        "description": flow.description or "",
-        "nodes": [node.model_dump(mode='json') for node in flow.nodes],
-        "edges": [edge.model_dump(mode='json') for edge in flow.edges],
-        "metadata": flow.metadata.model_dump(mode='json') if hasattr(flow.metadata, 'model_dump') else flow.metadata,
-        "is_featured": flow.is_featured,
-        "is_public": flow.is_public,
-        "category": flow.category,
-        "user_id": flow.user_id,
-    }
-
-    response = supabase.table("flows").insert(row).execute()
+    await invalidate_flow(flow.id)
 
     return _flow_from_db_row(response.data[0])
 
 
 @router.put("/{flow_id}", response_model=FlowDefinition)
-async def update_flow(flow_id: str, flow: FlowDefinition, user_id: Optional[str] = None) -> FlowDefinition:
+async def update_flow(
+    flow_id: str,
+    flow: FlowDefinition,
+    user_id: Optional[str] = None,
+    supabase: Any = Depends(get_async_supabase_client),
+) -> FlowDefinition:
     """Update an existing flow."""
-    supabase = get_supabase_client()
-
-    # Check if flow exists
-    existing = supabase.table("flows").select("*").eq("id", flow_id).execute()
-    if not existing.data:
-        raise HTTPException(status_code=404, detail="Flow not found")
-
-    # Enforce ownership
-    row = existing.data[0]
-    if user_id and row.get("user_id") and row["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Not authorized to modify this flow")
-
-    # Update flow
     flow.id = flow_id  # Ensure ID matches URL
-    row = {
-        "name": flow.name,
-        "description": flow.description or "",
-        "nodes": [node.model_dump(mode='json') for node in flow.nodes],
-        "edges": [edge.model_dump(mode='json') for edge in flow.edges],
-        "metadata": flow.metadata.model_dump(mode='json') if hasattr(flow.metadata, 'model_dump') else flow.metadata,
-        "is_featured": flow.is_featured,
-        "is_public": flow.is_public,
-        "category": flow.category,
-        "user_id": flow.user_id,
-    }
-
-    response = supabase.table("flows").update(row).eq("id", flow_id).execute()
+    query = supabase.table("flows").update(_flow_to_db_row(flow)).eq("id", flow_id)
+    response = await _owned_by(query, user_id).execute()
+    if not response.data:
+        await _raise_missing_or_forbidden(supabase, flow_id, "Not authorized to modify this flow")
+    await invalidate_flow(flow_id)
 
     return _flow_from_db_row(response.data[0])
 
 
 @router.delete("/{flow_id}", status_code=204)
-async def delete_flow(flow_id: str, user_id: Optional[str] = None) -> None:
+async def delete_flow(
+    flow_id: str,
+    user_id: Optional[str] = None,
+    supabase: Any = Depends(get_async_supabase_client),
+) -> None:
     """Delete a flow."""
-    supabase = get_supabase_client()
-
-    # Check if flow exists
-    existing = supabase.table("flows").select("*").eq("id", flow_id).execute()
-    if not existing.data:
-        raise HTTPException(status_code=404, detail="Flow not found")
-
-    # Enforce ownership
-    row = existing.data[0]
-    if user_id and row.get("user_id") and row["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this flow")
-
-    # Delete flow
-    supabase.table("flows").delete().eq("id", flow_id).execute()
+    query = supabase.table("flows").delete().eq("id", flow_id)
+    response = await _owned_by(query, user_id).execute()
+    if not response.data:
+        await _raise_missing_or_forbidden(supabase, flow_id, "Not authorized to delete this flow")
+    await invalidate_flow(flow_id)
 
 
 @router.post("/{flow_id}/compile")
-async def compile_flow(flow_id: str) -> dict[str, Any]:
+async def compile_flow(flow_id: str, supabase: Any = Depends(get_async_supabase_client)) -> JSONResponse:
     """Compile a flow into an executable representation."""
-    flow = await get_flow(flow_id)
-
-    from app.compiler.flow_compiler import FlowCompiler
+    flow, _ = await _load_flow(flow_id, supabase)
 
-    compiler = FlowCompiler()
     try:
-        result = compiler.compile(flow)
-        return {"status": "compiled", "execution_graph": result}
+        result = default_compiler.compile(flow)
+        return RawJSONResponse({"status": "compiled", "execution_graph": result})
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
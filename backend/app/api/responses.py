@@ -0,0 +1,21 @@
+"""Shared response classes for the API routers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+class RawJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson, for payloads that skip response models.
+
+    Plain dicts/lists/strings are encoded natively; anything else (e.g. the
+    Agno dataclasses inside a compiled graph) falls back to jsonable_encoder,
+    so the output matches FastAPI's default encoding.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_PASSTHROUGH_DATACLASS)
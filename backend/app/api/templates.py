@@ -10,10 +10,12 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
-from app.services.supabase_client import get_supabase_client
+from app.api.flows import invalidate_flow
+from app.api.responses import RawJSONResponse
+from app.services.supabase_client import get_async_supabase_client
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
 
@@ -39,24 +41,22 @@ def _template_from_row(row: dict[str, Any]) -> dict[str, Any]:
 
 
 @router.get("/featured")
-async def list_featured_templates() -> JSONResponse:
+async def list_featured_templates(supabase: Any = Depends(get_async_supabase_client)) -> JSONResponse:
     """List all featured templates (is_featured=True)."""
-    supabase = get_supabase_client()
-    response = (
+    response = await (
         supabase.table("flows")
         .select("*")
         .eq("is_featured", True)
         .order("name")
         .execute()
     )
-    return JSONResponse([_template_from_row(row) for row in response.data])
+    return RawJSONResponse([_template_from_row(row) for row in response.data])
 
 
 @router.get("/community")
-async def list_community_templates() -> JSONResponse:
+async def list_community_templates(supabase: Any = Depends(get_async_supabase_client)) -> JSONResponse:
     """List community-published flows (is_public=True, is_featured=False)."""
-    supabase = get_supabase_client()
-    response = (
+    response = await (
         supabase.table("flows")
         .select("*")
         .eq("is_public", True)
@@ -64,16 +64,14 @@ async def list_community_templates() -> JSONResponse:
         .order("created_at", desc=True)
         .execute()
     )
-    return JSONResponse([_template_from_row(row) for row in response.data])
+    return RawJSONResponse([_template_from_row(row) for row in response.data])
 
 
 @router.post("/{template_id}/use")
-async def use_template(template_id: str) -> JSONResponse:
+async def use_template(template_id: str, supabase: Any = Depends(get_async_supabase_client)) -> JSONResponse:
     """Clone a template as a new user flow (resets is_featured/is_public flags)."""
-    supabase = get_supabase_client()
-
     # Fetch the template
-    result = supabase.table("flows").select("*").eq("id", template_id).execute()
+    result = await supabase.table("flows").select("*").eq("id", template_id).execute()
     if not result.data:
         raise HTTPException(status_code=404, detail="Template not found")
 
@@ -96,8 +94,9 @@ async def use_template(template_id: str) -> JSONResponse:
         "category": template.get("category"),
     }
 
-    insert_result = supabase.table("flows").insert(new_flow).execute()
+    insert_result = await supabase.table("flows").insert(new_flow).execute()
     if not insert_result.data:
         raise HTTPException(status_code=500, detail="Failed to create flow from template")
+    await invalidate_flow(new_flow["id"])
 
-    return JSONResponse(_template_from_row(insert_result.data[0]))
+    return RawJSONResponse(_template_from_row(insert_result.data[0]))
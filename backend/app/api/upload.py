@@ -5,22 +5,64 @@ Endpoint: /api/upload
 
 from __future__ import annotations
 
+import asyncio
 import os
 import uuid
 from pathlib import Path
+from typing import Any, Callable, Coroutine
 
-from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi import APIRouter, HTTPException, Request, Response, UploadFile
+from fastapi.routing import APIRoute
 
 from app.services.file_validator import FileValidator
 
-router = APIRouter(prefix="/api/upload", tags=["upload"])
-
 # Upload directory for development
 UPLOAD_DIR = Path(__file__).resolve().parent.parent.parent / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-ALLOWED_EXTENSIONS = {".pdf", ".txt", ".md", ".csv", ".json", ".docx", ".pptx"}
+ALLOWED_EXTENSIONS: frozenset[str] = frozenset({".pdf", ".txt", ".md", ".csv", ".json", ".docx", ".pptx"})
+_ALLOWED_DISPLAY = ", ".join(sorted(ALLOWED_EXTENSIONS))
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+CHUNK_SIZE = 256 * 1024  # Streamed to disk in 256 KB pieces
+MULTIPART_OVERHEAD = 64 * 1024  # Slack for boundaries and part headers
+
+
+def _drop_page_cache(fd: int) -> None:
+    """Hint the kernel not to keep a just-written upload in the page cache."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds maximum size of {MAX_FILE_SIZE // (1024*1024)} MB",
+    )
+
+
+class _SizeLimitedRoute(APIRoute):
+    """Rejects oversized requests from Content-Length before the body is parsed.
+
+    FastAPI spools the whole multipart body before the endpoint runs, so the
+    check has to happen here rather than inside upload_file.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def size_limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+                raise _too_large()
+            return await handler(request)
+
+        return size_limited_handler
+
+
+router = APIRouter(prefix="/api/upload", tags=["upload"], route_class=_SizeLimitedRoute)
 
 
 @router.post("/")
@@ -36,36 +78,39 @@ async def upload_file(file: UploadFile) -> dict:
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"File type '{ext}' not allowed. Allowed: {ALLOWED_EXTENSIONS}",
-        )
-
-    # Read contents and check size
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File exceeds maximum size of {MAX_FILE_SIZE // (1024*1024)} MB",
+            detail=f"File type '{ext}' not allowed. Allowed: {_ALLOWED_DISPLAY}",
         )
 
-    # Validate file content
-    validator = FileValidator(contents, filename=file.filename)
-    validation_result = validator.validate()
-
-    if not validation_result["valid"]:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file: {validation_result['error']}"
-        )
-
-    # Save with a unique ID
+    # Stream to disk chunk by chunk, validating as we go
+    validator = FileValidator(b"", filename=file.filename)
     file_id = str(uuid.uuid4())
     dest = UPLOAD_DIR / f"{file_id}{ext}"
-    dest.write_bytes(contents)
+
+    try:
+        with dest.open("wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                if validator.size + len(chunk) > MAX_FILE_SIZE:
+                    raise _too_large()
+                validator.feed(chunk)
+                await asyncio.to_thread(out.write, chunk)
+            out.flush()
+            _drop_page_cache(out.fileno())
+
+        # Validate file content
+        validation_result = validator.validate()
+        if not validation_result["valid"]:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file: {validation_result['error']}"
+            )
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
 
     response = {
         "file_id": file_id,
         "filename": file.filename,
-        "size": len(contents),
+        "size": validator.size,
         "extension": ext,
         "path": str(dest),
         "file_type": validation_result["file_type"],
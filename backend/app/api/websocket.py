@@ -5,13 +5,14 @@ Endpoint: /ws/execution
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
+import orjson
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.compiler.flow_compiler import FlowCompiler
+from app.compiler.flow_compiler import default_compiler as compiler
 from app.models.flow import FlowDefinition
 from app.services.execution_engine import ExecutionEngine
 
@@ -35,11 +36,11 @@ class ConnectionManager:
             self.active_connections.remove(websocket)
 
     async def send_json(self, websocket: WebSocket, data: dict[str, Any]) -> None:
-        await websocket.send_json(data)
+        # Serialise with orjson but keep text frames; the client JSON.parses event.data
+        await websocket.send_text(orjson.dumps(data).decode())
 
 
 manager = ConnectionManager()
-compiler = FlowCompiler()
 engine = ExecutionEngine()
 
 
@@ -62,8 +63,8 @@ async def execution_websocket(websocket: WebSocket) -> None:
         while True:
             raw = await websocket.receive_text()
             try:
-                message = json.loads(raw)
-            except json.JSONDecodeError:
+                message = orjson.loads(raw)
+            except orjson.JSONDecodeError:
                 await manager.send_json(websocket, {"type": "error", "message": "Invalid JSON"})
                 continue
 
@@ -90,7 +91,7 @@ async def _handle_execute(websocket: WebSocket, message: dict[str, Any]) -> None
         return
 
     try:
-        flow = FlowDefinition(**flow_json)
+        flow = FlowDefinition.model_validate(flow_json)
     except Exception as e:
         await manager.send_json(websocket, {"type": "error", "message": f"Invalid flow: {e}"})
         return
@@ -9,38 +9,108 @@ execution graph.
 
 from __future__ import annotations
 
+import hashlib
+import sys
+from collections import OrderedDict, deque
 from typing import Any
 
+import orjson
+
 from app.models.flow import FlowDefinition
-from app.compiler.nodes import register_all_compilers
+from app.compiler.nodes import SHARED_COMPILERS
 
 
 class FlowCompiler:
     """Compiles a FlowDefinition into an executable graph."""
 
+    CACHE_SIZE = 128  # Validated graph structures kept per compiler instance (LRU)
+
     def __init__(self) -> None:
-        self._compilers: dict[str, Any] = {}
-        register_all_compilers(self)
+        # Plain dict copy of the shared registry: C-level lookups on the hot
+        # path, and register_compiler() overrides stay per-instance
+        self._compilers: dict[str, Any] = dict(SHARED_COMPILERS)
+        # Content hash -> (execution_order, adjacency, edges) of a flow that
+        # passed validation; compiled nodes are never cached here
+        self._cache: OrderedDict[bytes, tuple[list[str], dict[str, list[str]], list[dict[str, Any]]]] = OrderedDict()
 
     def register_compiler(self, node_type: str, compiler: Any) -> None:
-        self._compilers[node_type] = compiler
+        self._compilers[sys.intern(node_type)] = compiler
+        self._cache.clear()
 
     def compile(self, flow: FlowDefinition) -> dict[str, Any]:
-        errors = self._validate(flow)
+        """
+        Compile a flow, reusing the validated structure of unchanged content.
+
+        Nodes are compiled on every call, so each run gets its own agents
+        (cacheable node compilers still memoize via compile_cached). The
+        structural parts of the graph (execution_order, adjacency, edges)
+        are shared between calls for the same content and must not be mutated.
+        """
+        # Reject before dumping, hashing or building any graph
+        if not flow.nodes:
+            raise ValueError("Flow validation failed: ['Flow must have at least one node.']")
+
+        # One dump feeds both the cache key and the graph's edge list
+        content = flow.model_dump(mode="json", include={"id", "name", "nodes", "edges"})
+        key = self._cache_key(content)
+        structure = self._cache.get(key)
+        if structure is not None:
+            self._cache.move_to_end(key)
+        else:
+            structure = self._validate_structure(flow, content["edges"])
+            self._cache[key] = structure
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        return self._compile_nodes(flow, *structure)
+
+    @staticmethod
+    def _cache_key(content: dict[str, Any]) -> bytes:
+        """Hash of everything that feeds the compiled graph (metadata excluded)."""
+        return hashlib.blake2b(
+            orjson.dumps(content, option=orjson.OPT_SORT_KEYS),
+            digest_size=16,
+        ).digest()
+
+    def _validate_structure(
+        self, flow: FlowDefinition, edges: list[dict[str, Any]]
+    ) -> tuple[list[str], dict[str, list[str]], list[dict[str, Any]]]:
+        """Validate the graph and node configs; returns (execution_order, adjacency, edges)."""
+        node_map, adjacency, in_degree, errors = self._build_graph(flow)
         if errors:
             raise ValueError(f"Flow validation failed: {errors}")
 
-        adjacency = self._build_adjacency(flow)
-        sorted_node_ids = self._topological_sort(flow, adjacency)
-
-        compiled_nodes: dict[str, Any] = {}
+        sorted_node_ids = self._topological_sort(adjacency, in_degree)
+
+        get_compiler = self._compilers.get
+        # NodeType is a str enum, so members hash and compare like their values
+        node_errors = [
+            error
+            for node in flow.nodes
+            if (compiler := get_compiler(node.type)) is not None and compiler.has_validate
+            for error in compiler.validate(node)
+        ]
+        if node_errors:
+            raise ValueError(f"Flow validation failed: {node_errors}")
+
+        return sorted_node_ids, adjacency, edges
+
+    def _compile_nodes(
+        self,
+        flow: FlowDefinition,
+        sorted_node_ids: list[str],
+        adjacency: dict[str, list[str]],
+        edges: list[dict[str, Any]],
+    ) -> dict[str, Any]:
         node_map = {n.id: n for n in flow.nodes}
+        get_compiler = self._compilers.get
+        compiled_nodes: dict[str, Any] = {}
 
         for node_id in sorted_node_ids:
             node = node_map[node_id]
-            compiler = self._compilers.get(node.type.value)
+            compiler = get_compiler(node.type)
             if compiler:
-                compiled_nodes[node_id] = compiler.compile(node, context=compiled_nodes)
+                compiled_nodes[node_id] = compiler.compile_cached(node, context=compiled_nodes)
             else:
                 compiled_nodes[node_id] = {"node_id": node.id, "node_type": node.type.value, "raw": True}
 
@@ -48,46 +118,57 @@ class FlowCompiler:
             "flow_id": flow.id,
             "flow_name": flow.name,
             "compiled_nodes": compiled_nodes,
-            "edges": [edge.model_dump() for edge in flow.edges],
+            "edges": edges,
             "adjacency": adjacency,
             "execution_order": sorted_node_ids,
         }
 
-    def _validate(self, flow: FlowDefinition) -> list[str]:
+    def _build_graph(
+        self, flow: FlowDefinition
+    ) -> tuple[dict[str, Any], dict[str, list[str]], dict[str, int], list[str]]:
+        """
+        Validate the flow and build its graph in one pass over nodes and edges.
+
+        Returns (node_map, adjacency, in_degree, errors); the graph is only
+        meaningful when ``errors`` is empty.
+        """
         errors: list[str] = []
-        if not flow.nodes:
-            errors.append("Flow must have at least one node.")
-        node_ids = {n.id for n in flow.nodes}
+        node_map = {n.id: n for n in flow.nodes}
+        adjacency: dict[str, list[str]] = {nid: [] for nid in node_map}
+        in_degree: dict[str, int] = dict.fromkeys(node_map, 0)
+
         for edge in flow.edges:
-            if edge.source not in node_ids:
+            source_known = edge.source in node_map
+            target_known = edge.target in node_map
+            if not source_known:
                 errors.append(f"Edge {edge.id} references unknown source: {edge.source}")
-            if edge.target not in node_ids:
+            if not target_known:
                 errors.append(f"Edge {edge.id} references unknown target: {edge.target}")
-        return errors
+            if source_known and target_known:
+                adjacency[edge.source].append(edge.target)
+                in_degree[edge.target] += 1
 
-    def _build_adjacency(self, flow: FlowDefinition) -> dict[str, list[str]]:
-        adjacency: dict[str, list[str]] = {n.id: [] for n in flow.nodes}
-        for edge in flow.edges:
-            adjacency[edge.source].append(edge.target)
-        return adjacency
+        return node_map, adjacency, in_degree, errors
 
-    def _topological_sort(self, flow: FlowDefinition, adjacency: dict[str, list[str]]) -> list[str]:
-        in_degree: dict[str, int] = {n.id: 0 for n in flow.nodes}
-        for edge in flow.edges:
-            in_degree[edge.target] += 1
-
-        queue = [nid for nid, deg in in_degree.items() if deg == 0]
+    def _topological_sort(self, adjacency: dict[str, list[str]], in_degree: dict[str, int]) -> list[str]:
+        """Kahn's algorithm; consumes ``in_degree``."""
+        queue = deque(nid for nid, deg in in_degree.items() if deg == 0)
         sorted_ids: list[str] = []
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             sorted_ids.append(current)
-            for neighbor in adjacency.get(current, []):
+            for neighbor in adjacency[current]:
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
 
-        if len(sorted_ids) != len(flow.nodes):
+        if len(sorted_ids) != len(adjacency):
             raise ValueError("Flow contains a cycle. Topological sort is not possible.")
 
         return sorted_ids
+
+
+# Shared by the API routes so REST compiles and websocket runs reuse one
+# structure cache
+default_compiler = FlowCompiler()
@@ -1,5 +1,7 @@
 """Plugin-based node compiler registry."""
 
+import sys
+
 from app.compiler.nodes.base import BaseNodeCompiler
 from app.compiler.nodes.input_compiler import InputNodeCompiler
 from app.compiler.nodes.agent_compiler import AgentNodeCompiler
@@ -26,15 +28,23 @@ ALL_COMPILERS: list[type[BaseNodeCompiler]] = [
 ]
 
 
+# Node compilers are stateless, so one instance of each is shared by every FlowCompiler
+# Keys are interned so lookups by NodeType values (also interned literals)
+# short-circuit on identity
+SHARED_COMPILERS: dict[str, BaseNodeCompiler] = {
+    sys.intern(cls.node_type): cls() for cls in ALL_COMPILERS
+}
+
+
 def register_all_compilers(flow_compiler: object) -> None:
     """Register every node compiler with a FlowCompiler instance."""
-    for compiler_cls in ALL_COMPILERS:
-        instance = compiler_cls()
-        flow_compiler.register_compiler(instance.node_type, instance)  # type: ignore[attr-defined]
+    for node_type, instance in SHARED_COMPILERS.items():
+        flow_compiler.register_compiler(node_type, instance)  # type: ignore[attr-defined]
 
 
 __all__ = [
     "BaseNodeCompiler",
     "ALL_COMPILERS",
+    "SHARED_COMPILERS",
     "register_all_compilers",
 ]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import importlib
 import logging
 from typing import Any
 
@@ -28,38 +30,64 @@ TOOL_FACTORIES: dict[str, tuple[str, str, dict[str, Any]]] = {
 }
 
 
+@functools.cache
+def resolve_model_class(provider: str) -> type:
+    """Import and cache the Agno model class for a provider."""
+    module_path, class_name = MODEL_FACTORIES[provider]
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+@functools.cache
+def resolve_tool_class(name: str) -> type:
+    """Import and cache the Agno tool class for a tool name."""
+    module_path, class_name, _ = TOOL_FACTORIES[name]
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def preload_factories() -> None:
+    """Resolve every registered model/tool class up front (e.g. at startup).
+
+    Providers whose optional dependencies aren't installed are skipped and
+    will raise when a node actually uses them.
+    """
+    for provider in MODEL_FACTORIES:
+        try:
+            resolve_model_class(provider)
+        except ImportError as e:
+            logger.debug("Model provider '%s' unavailable: %s", provider, e)
+    for name in TOOL_FACTORIES:
+        try:
+            resolve_tool_class(name)
+        except ImportError as e:
+            logger.debug("Tool '%s' unavailable: %s", name, e)
+
+
 def _create_model(provider: str, model_id: str) -> Any:
-    """Dynamically import and instantiate an Agno model class."""
+    """Instantiate an Agno model class."""
     if provider not in MODEL_FACTORIES:
         raise ValueError(f"Unknown model provider: {provider}")
 
-    module_path, class_name = MODEL_FACTORIES[provider]
-    import importlib
-    module = importlib.import_module(module_path)
-    model_cls = getattr(module, class_name)
-    return model_cls(id=model_id)
+    # No http_client here: the engine attaches the shared pool at run time,
+    # keeping compiled agents serializable for the /compile response
+    return resolve_model_class(provider)(id=model_id)
 
 
 def _create_tools(tool_names: list[str]) -> list[Any]:
-    """Dynamically import and instantiate Agno tool classes."""
+    """Instantiate Agno tool classes."""
     tools = []
     for name in tool_names:
         if name not in TOOL_FACTORIES:
             logger.warning("Unknown tool '%s', skipping", name)
             continue
-        module_path, class_name, kwargs = TOOL_FACTORIES[name]
-        import importlib
-        module = importlib.import_module(module_path)
-        tool_cls = getattr(module, class_name)
-        tools.append(tool_cls(**kwargs))
+        kwargs = TOOL_FACTORIES[name][2]
+        tools.append(resolve_tool_class(name)(**kwargs))
     return tools
 
 
 class AgentNodeCompiler(BaseNodeCompiler):
 
-    @property
-    def node_type(self) -> str:
-        return "agent"
+    __slots__ = ()
+    node_type = "agent"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         from agno.agent import Agent
@@ -91,4 +119,5 @@ class AgentNodeCompiler(BaseNodeCompiler):
             "node_type": self.node_type,
             "agent": agent,
             "temperature": cfg.temperature,
+            "cache_bust": cfg.cache_bust,
         }
@@ -18,9 +18,10 @@ class ApifyActorNodeCompiler(BaseNodeCompiler):
     API: https://docs.apify.com/api/v2#/reference/actors/run-collection
     """
 
-    @property
-    def node_type(self) -> str:
-        return "apify_actor"
+    __slots__ = ()
+    node_type = "apify_actor"
+    cacheable = True
+    config_field = "apify_actor"
 
     def compile(self, node: FlowNode, context: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         config = node.config.apify_actor
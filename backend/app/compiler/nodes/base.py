@@ -7,18 +7,24 @@ compiler class that extends BaseNodeCompiler and implements compile().
 
 To add support for a new node type:
   1. Create a new file in app/compiler/nodes/ (e.g. agent_compiler.py)
-  2. Subclass BaseNodeCompiler
+  2. Subclass BaseNodeCompiler and set its node_type
   3. Implement the compile() method
   4. Register the compiler in the node compiler registry
 """
 
 from __future__ import annotations
 
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict
+from typing import Any, ClassVar, Optional
 
 from app.models.flow import FlowNode
 
+# Compiled results of cacheable nodes, shared by all compilers (LRU)
+NODE_CACHE_SIZE = 512
+_node_cache: OrderedDict[tuple[str, bytes], Any] = OrderedDict()
+
 
 class BaseNodeCompiler(ABC):
     """
@@ -27,8 +33,31 @@ class BaseNodeCompiler(ABC):
     The compile() method receives a FlowNode (from the canvas JSON)
     and returns a runtime-ready object (e.g. an Agno Agent, Team,
     Tool instance, or any intermediate representation).
+
+    Compilers whose output is derived only from the node's id and config
+    set ``cacheable = True`` so repeat compiles are served by
+    compile_cached(). Compilers that build per-run objects (agents) or
+    read the compile context leave it off.
     """
 
+    # Compilers are stateless singletons; no per-instance __dict__
+    __slots__ = ()
+
+    node_type: ClassVar[str]
+    """The NodeType string this compiler handles."""
+
+    cacheable: ClassVar[bool] = False
+    # NodeConfig field this compiler reads; narrows the cache key to that slice
+    config_field: ClassVar[Optional[str]] = None
+    # Set per subclass: whether validate() is overridden and worth calling
+    has_validate: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if not getattr(cls, "node_type", ""):
+            raise TypeError(f"{cls.__name__} must set a non-empty node_type class attribute")
+        cls.has_validate = cls.validate is not BaseNodeCompiler.validate
+
     @abstractmethod
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> Any:
         """
@@ -51,6 +80,44 @@ class BaseNodeCompiler(ABC):
         """
         ...
 
+    def cache_key(self, node: FlowNode) -> Optional[bytes]:
+        """Content hash identifying this node's compiled output, or None to skip caching."""
+        if not self.cacheable:
+            return None
+        config = getattr(node.config, self.config_field) if self.config_field else node.config
+        digest = hashlib.blake2b(node.id.encode(), digest_size=8)
+        digest.update(b"\0")
+        # Serialize straight to JSON bytes in pydantic-core (no str round-trip)
+        digest.update(config.__pydantic_serializer__.to_json(config) if config is not None else b"null")
+        return digest.digest()
+
+    def compile_cached(self, node: FlowNode, context: dict[str, Any] | None = None) -> Any:
+        """compile(), memoized on cache_key() for cacheable compilers.
+
+        Cached results are shared between compiles, not copied, so they are
+        read-only by convention.
+        """
+        key = self.cache_key(node)
+        if key is None:
+            return self.compile(node, context=context)
+
+        cache_key = (self.node_type, key)
+        cached = _node_cache.get(cache_key)
+        if cached is None:
+            cached = self.compile(node, context=context)
+            if not self.should_cache(cached):
+                return cached
+            _node_cache[cache_key] = cached
+            if len(_node_cache) > NODE_CACHE_SIZE:
+                _node_cache.popitem(last=False)
+        else:
+            _node_cache.move_to_end(cache_key)
+        return cached
+
+    def should_cache(self, compiled: Any) -> bool:
+        """Whether a freshly compiled result may be memoized (e.g. not a soft failure)."""
+        return True
+
     def validate(self, node: FlowNode) -> list[str]:
         """
         Optional validation hook. Returns a list of error messages.
@@ -60,9 +127,3 @@ class BaseNodeCompiler(ABC):
         validation before compilation.
         """
         return []
-
-    @property
-    @abstractmethod
-    def node_type(self) -> str:
-        """Return the NodeType string this compiler handles."""
-        ...
@@ -10,17 +10,24 @@ from app.models.flow import FlowNode
 
 class ConditionalNodeCompiler(BaseNodeCompiler):
 
-    @property
-    def node_type(self) -> str:
-        return "conditional"
+    __slots__ = ()
+    node_type = "conditional"
+    cacheable = True
+    config_field = "conditional"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         _ = context
         cond_cfg = node.config.conditional
+        if cond_cfg is None:
+            condition, true_label, false_label = "", "True", "False"
+        else:
+            condition = cond_cfg.condition_expression
+            true_label = cond_cfg.true_label
+            false_label = cond_cfg.false_label
         return {
             "node_id": node.id,
             "node_type": self.node_type,
-            "condition": cond_cfg.condition_expression if cond_cfg else "",
-            "true_label": cond_cfg.true_label if cond_cfg else "True",
-            "false_label": cond_cfg.false_label if cond_cfg else "False",
+            "condition": condition,
+            "true_label": true_label,
+            "false_label": false_label,
         }
@@ -18,9 +18,10 @@ class FirecrawlScrapeNodeCompiler(BaseNodeCompiler):
     API: https://docs.firecrawl.dev/api-reference/endpoint/scrape
     """
 
-    @property
-    def node_type(self) -> str:
-        return "firecrawl_scrape"
+    __slots__ = ()
+    node_type = "firecrawl_scrape"
+    cacheable = True
+    config_field = "firecrawl_scrape"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         """
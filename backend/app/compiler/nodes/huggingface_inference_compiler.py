@@ -18,9 +18,10 @@ class HuggingFaceInferenceNodeCompiler(BaseNodeCompiler):
     API: https://huggingface.co/docs/api-inference/
     """
 
-    @property
-    def node_type(self) -> str:
-        return "huggingface_inference"
+    __slots__ = ()
+    node_type = "huggingface_inference"
+    cacheable = True
+    config_field = "huggingface_inference"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         """
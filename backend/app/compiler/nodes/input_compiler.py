@@ -2,20 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from app.compiler.nodes.base import BaseNodeCompiler
 from app.models.flow import FlowNode
 
+# Read-only stand-in for a missing context; avoids a fresh dict per compile
+_EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
 
 class InputNodeCompiler(BaseNodeCompiler):
 
-    @property
-    def node_type(self) -> str:
-        return "input"
+    __slots__ = ()
+    node_type = "input"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
-        context = context or {}
+        context = context if context is not None else _EMPTY_CONTEXT
         io_cfg = node.config.input_output
         return {
             "node_id": node.id,
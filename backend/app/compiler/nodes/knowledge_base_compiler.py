@@ -2,18 +2,67 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import os
-from typing import Any
+from typing import Any, Optional
 
 from app.compiler.nodes.base import BaseNodeCompiler
 from app.models.flow import FlowNode
 
 
+def _db_url() -> str:
+    """DATABASE_URL as currently set (read per call, like the other env settings)."""
+    return os.environ.get("DATABASE_URL", "")
+
+
+@functools.cache
+def _pgvector_classes() -> Optional[tuple[type, type]]:
+    """Import (Knowledge, PgVector) on first use; None if the extras are missing.
+
+    Deferred because PgVector pulls in SQLAlchemy, which would otherwise be
+    paid by every import of the compiler registry.
+    """
+    try:
+        from agno.knowledge import Knowledge
+        from agno.vectordb.pgvector import PgVector
+    except ImportError:  # pgvector extras not installed
+        return None
+    return Knowledge, PgVector
+
+
+@functools.lru_cache(maxsize=4)
+def _get_pgvector_client(db_url: str) -> Any:
+    """One PgVector client (and its connection pool) per database URL."""
+    _, PgVector = _pgvector_classes()
+    return PgVector(
+        table_name="kb_embeddings",
+        db_url=db_url,
+    )
+
+
+def _uses_pgvector(kb_cfg: Any) -> bool:
+    """Whether a knowledge_base config gets a PgVector-backed Knowledge."""
+    return kb_cfg is not None and kb_cfg.vector_db == "pgvector" and bool(kb_cfg.sources)
+
+
 class KnowledgeBaseNodeCompiler(BaseNodeCompiler):
 
-    @property
-    def node_type(self) -> str:
-        return "knowledge_base"
+    __slots__ = ()
+    node_type = "knowledge_base"
+    cacheable = True
+    config_field = "knowledge_base"
+
+    def cache_key(self, node: FlowNode) -> Optional[bytes]:
+        key = super().cache_key(node)
+        if not _uses_pgvector(node.config.knowledge_base):
+            return key
+        # The PgVector-backed Knowledge depends on DATABASE_URL as well
+        return hashlib.blake2b(key + _db_url().encode(), digest_size=8).digest()
+
+    def should_cache(self, compiled: Any) -> bool:
+        # Don't pin a transient PgVector setup failure
+        return "knowledge_error" not in compiled
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         _ = context
@@ -31,15 +80,17 @@ class KnowledgeBaseNodeCompiler(BaseNodeCompiler):
             "chunk_overlap": kb_cfg.chunk_overlap,
         }
 
-        # If PgVector is configured and sources are available, create an Agno
-        # Knowledge object that the execution engine can use for RAG queries.
-        if kb_cfg.vector_db == "pgvector" and kb_cfg.sources:
-            try:
-                knowledge = self._build_pgvector_knowledge(kb_cfg)
-                compiled["knowledge"] = knowledge
-            except Exception as e:
-                # Non-fatal: fall back to placeholder RAG if deps are missing
-                compiled["knowledge_error"] = str(e)
+        # Without PgVector sources the engine uses placeholder RAG; done
+        if not _uses_pgvector(kb_cfg):
+            return compiled
+
+        # Otherwise create an Agno Knowledge object that the execution
+        # engine can use for RAG queries.
+        try:
+            compiled["knowledge"] = self._build_pgvector_knowledge(kb_cfg)
+        except Exception as e:
+            # Non-fatal: fall back to placeholder RAG if deps are missing
+            compiled["knowledge_error"] = str(e)
 
         return compiled
 
@@ -50,17 +101,16 @@ class KnowledgeBaseNodeCompiler(BaseNodeCompiler):
         Creates an empty Knowledge instance. Documents will be loaded
         async during execution to avoid event loop conflicts.
         """
-        from agno.knowledge import Knowledge
-        from agno.vectordb.pgvector import PgVector
+        classes = _pgvector_classes()
+        if classes is None:
+            raise RuntimeError("agno pgvector support is not installed — cannot initialise PgVector")
 
-        db_url = os.environ.get("DATABASE_URL", "")
+        db_url = _db_url()
         if not db_url:
             raise RuntimeError("DATABASE_URL not set — cannot initialise PgVector")
 
-        vector_db = PgVector(
-            table_name="kb_embeddings",
-            db_url=db_url,
-        )
+        Knowledge, _ = classes
+        vector_db = _get_pgvector_client(db_url)
 
         # Create empty Knowledge instance with vector DB
         # Documents will be loaded async in execution engine
@@ -18,9 +18,10 @@ class MCPServerNodeCompiler(BaseNodeCompiler):
     Spec: https://modelcontextprotocol.io/
     """
 
-    @property
-    def node_type(self) -> str:
-        return "mcp_server"
+    __slots__ = ()
+    node_type = "mcp_server"
+    cacheable = True
+    config_field = "mcp_server"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         """
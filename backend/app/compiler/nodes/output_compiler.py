@@ -10,9 +10,10 @@ from app.models.flow import FlowNode
 
 class OutputNodeCompiler(BaseNodeCompiler):
 
-    @property
-    def node_type(self) -> str:
-        return "output"
+    __slots__ = ()
+    node_type = "output"
+    cacheable = True
+    config_field = "input_output"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         _ = context
@@ -4,29 +4,29 @@ from __future__ import annotations
 
 from typing import Any
 
+from app.compiler.nodes.agent_compiler import resolve_model_class, resolve_tool_class
 from app.compiler.nodes.base import BaseNodeCompiler
 from app.models.flow import FlowNode
 
 
 class WebSearchNodeCompiler(BaseNodeCompiler):
 
-    @property
-    def node_type(self) -> str:
-        return "tool"
+    __slots__ = ()
+    node_type = "tool"
 
     def compile(self, node: FlowNode, context: dict[str, Any] | None = None) -> dict[str, Any]:
         from agno.agent import Agent
-        from agno.models.openai import OpenAIChat
-        from agno.tools.duckduckgo import DuckDuckGoTools
 
         _ = context  # unused but required by interface
         tool_cfg = node.config.tool
         params = tool_cfg.parameters if tool_cfg else {}
 
+        # Classes come from the shared resolvers; the Agent itself carries
+        # per-run state, so each compile still gets its own instance
         agent = Agent(
             name="Web Search Agent",
-            model=OpenAIChat(id="gpt-4o-mini"),
-            tools=[DuckDuckGoTools()],
+            model=resolve_model_class("openai")(id="gpt-4o-mini"),
+            tools=[resolve_tool_class("web_search")()],
             instructions="Search the web and return relevant results.",
             markdown=True,
         )
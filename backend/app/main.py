@@ -8,6 +8,7 @@ Run with:
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -22,15 +23,31 @@ from app.api.credentials import router as credentials_router
 from app.api.export import router as export_router
 from app.api.templates import router as templates_router
 from app.api.chat import router as chat_router
+from app.compiler.nodes.agent_compiler import preload_factories
+from app.services.llm_http_client import close_llm_http_client
+from app.services.supabase_client import AsyncSupabaseHolder, preload_supabase
 
 # ---------------------------------------------------------------------------
 # Application
 # ---------------------------------------------------------------------------
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import Agno model/tool classes once, before the first compile needs them
+    preload_factories()
+    preload_supabase()
+    app.state.supabase = AsyncSupabaseHolder()
+    yield
+    await app.state.supabase.aclose()
+    await close_llm_http_client()
+
+
 app = FastAPI(
     title="AgnoFlow API",
     description="Backend API for CoconutFlow — a visual AI agent builder powered by the Agno SDK.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # ---------------------------------------------------------------------------
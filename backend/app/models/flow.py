@@ -5,7 +5,7 @@ Matches PRD Section 10 Flow JSON specification.
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional
 
@@ -80,6 +80,7 @@ class AgentConfig(BaseModel):
     instructions: list[str] = Field(default_factory=list)
     show_tool_calls: bool = True
     markdown: bool = True
+    cache_bust: bool = False  # Always call the provider, bypassing cached responses
 
 
 class TeamConfig(BaseModel):
@@ -234,10 +235,14 @@ class FlowEdge(BaseModel):
 # Metadata & top-level definition
 # ---------------------------------------------------------------------------
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class FlowMetadata(BaseModel):
     """Metadata attached to a flow definition."""
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     version: str = "1.0.0"
     author: Optional[str] = None
     tags: list[str] = Field(default_factory=list)
@@ -1,22 +1,45 @@
 """
 Runtime Execution Engine.
 
-Walks a compiled execution graph node-by-node, calls Agno agents,
-and yields streaming events for the WebSocket.
+Walks a compiled execution graph, running nodes whose inputs are ready
+concurrently, calls Agno agents, and yields streaming events for the
+WebSocket.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import logging
-from datetime import datetime, timezone
-from typing import Any, AsyncIterator
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable
+
+import orjson
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+from agno.run.base import RunStatus
+
+from app.services.llm_cache import LLMCache, llm_cache as shared_llm_cache
+from app.services.llm_http_client import get_llm_http_client
+from app.services.output_normalizer import OutputEnvelope
+from app.services.source_detector import SourceDetector, SourceType
 
 logger = logging.getLogger(__name__)
 
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 class ExecutionEvent:
     """A single event emitted during flow execution."""
 
+    __slots__ = ("type", "node_id", "flow_id", "data", "message", "_ts_ns", "_timestamp")
+
     def __init__(
         self,
         event_type: str,
@@ -30,7 +53,16 @@ class ExecutionEvent:
         self.flow_id = flow_id
         self.data = data
         self.message = message
-        self.timestamp = datetime.now(timezone.utc).isoformat()
+        # Capture the time cheaply; format to ISO-8601 only when read
+        self._ts_ns = time.time_ns()
+        self._timestamp: str | None = None
+
+    @property
+    def timestamp(self) -> str:
+        if self._timestamp is None:
+            moment = _EPOCH + timedelta(microseconds=self._ts_ns // 1000)
+            self._timestamp = moment.isoformat()
+        return self._timestamp
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -45,22 +77,230 @@ class ExecutionEvent:
 
 def _get_upstream_output(
     node_id: str,
-    edges: list[dict[str, Any]],
+    incoming: dict[str, list[dict[str, Any]]],
     node_outputs: dict[str, str],
 ) -> str:
     """Collect outputs from all upstream nodes connected to this node."""
-    upstream_ids = [e["source"] for e in edges if e["target"] == node_id]
-    parts = [node_outputs[uid] for uid in upstream_ids if uid in node_outputs]
-    if len(parts) == 1:
-        return parts[0]
-    return "\n\n".join(f"[Input from {uid}]:\n{node_outputs[uid]}" for uid in upstream_ids if uid in node_outputs)
+    # One pass over the parents; join a list rather than a generator
+    available = [
+        (e["source"], node_outputs[e["source"]])
+        for e in incoming.get(node_id, ())
+        if e["source"] in node_outputs
+    ]
+    if len(available) == 1:
+        return available[0][1]
+    return "\n\n".join([f"[Input from {uid}]:\n{output}" for uid, output in available])
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _settings(obj: Any) -> tuple[Any, ...]:
+    """An object's class and public scalar attributes (sampling params, tool flags)."""
+    fields = getattr(obj, "__dict__", {})
+    return (type(obj).__name__, tuple(sorted(
+        (name, value) for name, value in fields.items()
+        if not name.startswith("_") and isinstance(value, _SCALARS)
+    )))
+
+
+def _agent_call_key(agent: Any, prompt: str) -> bytes:
+    """Identify an agent run by everything that shapes the provider request."""
+    parts = (
+        _settings(getattr(agent, "model", None)),
+        getattr(agent, "name", None),
+        getattr(agent, "instructions", None),
+        getattr(agent, "markdown", None),
+        tuple(_settings(tool) for tool in getattr(agent, "tools", None) or ()),
+    )
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16)
+    digest.update(b"\0")
+    digest.update(prompt.encode())
+    return digest.digest()
+
+
+_EVALUATOR_INSTRUCTIONS = (
+    "You are a condition evaluator. Given the context and condition below, "
+    "respond with ONLY 'true' or 'false'. Nothing else.\n\n"
+    "Condition: {condition}"
+)
+_RAG_INSTRUCTIONS = (
+    "You are a helpful assistant. Answer the user's question using the "
+    "knowledge base provided. If you cannot find the answer in the knowledge "
+    "base, say so clearly."
+)
+
+
+def _use_shared_http_client(agent: Any) -> None:
+    """Route an OpenAI-backed agent through the shared connection pool.
+
+    Done at run time rather than when the agent is built, so compiled graphs
+    never hold the live httpx client (which can't be deep-copied).
+    """
+    model = getattr(agent, "model", None)
+    if isinstance(model, OpenAIChat) and model.http_client is None:
+        model.http_client = get_llm_http_client()
+
+
+@dataclass(frozen=True, slots=True)
+class _ExecutionPlan:
+    """Per-graph scheduling indexes; read-only, shared across runs."""
+
+    position: dict[str, int]  # Node id -> index in execution_order
+    incoming: dict[str, list[dict[str, Any]]]  # Node id -> edges into it
+    children: dict[str, list[str]]  # Node id -> downstream node ids
+    indegree: dict[str, int]  # Copied per run as the countdown of unfinished parents
+    roots: tuple[str, ...]  # Nodes with no upstream, in execution order
 
 
 class ExecutionEngine:
     """Executes a compiled flow graph and yields streaming events."""
 
-    def __init__(self, condition_evaluator=None):
+    MAX_CONCURRENCY = 8  # Provider calls in flight at once, across all runs
+    KB_LOAD_CONCURRENCY = 8  # Knowledge-base sources fetched at once per node
+    PLAN_CACHE_SIZE = 128  # Prepared graphs kept (LRU)
+
+    def __init__(
+        self,
+        condition_evaluator=None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        llm_cache: LLMCache | None = None,
+    ):
         self._condition_evaluator = condition_evaluator
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._llm_cache = llm_cache if llm_cache is not None else shared_llm_cache
+        # Identical agent calls already in flight; later callers share the result
+        self._inflight: dict[bytes, asyncio.Future[str]] = {}
+        self._waiters: dict[bytes, int] = {}  # Callers awaiting each in-flight call
+        self._plans: OrderedDict[int, tuple[list[str], list[dict[str, Any]], _ExecutionPlan]] = OrderedDict()
+        # Knowledge objects already loaded, by id(); entries drop when the
+        # knowledge is garbage-collected, so a recycled id() can't match
+        self._loaded_knowledge: dict[int, weakref.ref[Any]] = {}
+
+    async def _run_agent(
+        self,
+        agent: Any,
+        prompt: str,
+        cache_bust: bool = False,
+        on_delta: Callable[[str], None] | None = None,
+    ) -> str:
+        """agent.arun(prompt), served from the response cache when possible,
+        otherwise bounded by the semaphore and coalesced with any identical
+        call still in flight. ``cache_bust`` skips the cache lookup (the fresh
+        response still replaces the cached one).
+
+        With ``on_delta`` the response is streamed and each text delta passed
+        to it as it arrives; cached or coalesced responses arrive as a single
+        delta. The deltas always concatenate to the returned string; if the
+        run fails instead, deltas already sent are void (clients clear the
+        node's output on its error event).
+        """
+        key = _agent_call_key(agent, prompt)
+        if not cache_bust:
+            cached = self._llm_cache.get(key)
+            if cached is not None:
+                if on_delta and cached:
+                    on_delta(cached)
+                return cached
+
+        pending = self._inflight.get(key)
+        joined = pending is not None
+        if pending is None:
+            pending = asyncio.ensure_future(self._call_agent(agent, prompt, key, on_delta))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one cancelled waiter doesn't cancel the shared call;
+        # the call itself is cancelled once its last waiter is gone
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            content = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1:
+                pending.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+        if joined and on_delta and content:
+            on_delta(content)
+        return content
+
+    async def _call_agent(
+        self,
+        agent: Any,
+        prompt: str,
+        key: bytes,
+        on_delta: Callable[[str], None] | None = None,
+    ) -> str:
+        _use_shared_http_client(agent)
+        async with self._semaphore:
+            if on_delta is None:
+                response = await agent.arun(prompt)
+                content = response.content or ""
+                # Agno reports provider failures (429, timeouts, auth) as a
+                # returned run with an error status rather than raising
+                if getattr(response, "status", None) in (RunStatus.error, RunStatus.cancelled):
+                    raise RuntimeError(content or "Agent run failed")
+                completed = True
+            else:
+                parts: list[str] = []
+                completed = False
+                async for event in agent.arun(prompt, stream=True):
+                    kind = getattr(event, "event", "RunContent")
+                    if kind in ("RunError", "RunCancelled"):
+                        raise RuntimeError(event.content or "Agent run failed")
+                    if kind == "RunCompleted":
+                        completed = True
+                    delta = getattr(event, "content", None)
+                    if kind == "RunContent" and isinstance(delta, str) and delta:
+                        parts.append(delta)
+                        on_delta(delta)
+                content = "".join(parts)
+        # Only finished, non-empty answers are worth replaying
+        if completed and content:
+            self._llm_cache.set(key, content)
+        return content
+
+    def _prepare(self, execution_graph: dict[str, Any]) -> _ExecutionPlan:
+        """Scheduling indexes for a graph, cached while its structure is reused.
+
+        FlowCompiler shares the execution_order and edges lists between
+        compiles of unchanged flows, so replays skip re-indexing the edges.
+        """
+        execution_order: list[str] = execution_graph.get("execution_order", [])
+        edges: list[dict[str, Any]] = execution_graph.get("edges", [])
+        graph_id = id(execution_order)
+        cached = self._plans.get(graph_id)
+        if cached is not None and cached[0] is execution_order and cached[1] is edges:
+            self._plans.move_to_end(graph_id)
+            return cached[2]
+
+        # Edges indexed by target once, so per-node lookups don't scan them all
+        incoming: dict[str, list[dict[str, Any]]] = {}
+        children: dict[str, list[str]] = {nid: [] for nid in execution_order}
+        indegree: dict[str, int] = dict.fromkeys(execution_order, 0)
+        for edge in edges:
+            source, target = edge["source"], edge["target"]
+            incoming.setdefault(target, []).append(edge)
+            if source in children and target in indegree:
+                children[source].append(target)
+                indegree[target] += 1
+
+        plan = _ExecutionPlan(
+            position={nid: i for i, nid in enumerate(execution_order)},
+            incoming=incoming,
+            children=children,
+            indegree=indegree,
+            roots=tuple(nid for nid in execution_order if indegree[nid] == 0),
+        )
+        # Keeping the lists alongside guards against a recycled id()
+        self._plans[graph_id] = (execution_order, edges, plan)
+        if len(self._plans) > self.PLAN_CACHE_SIZE:
+            self._plans.popitem(last=False)
+        return plan
 
     async def execute(
         self,
@@ -70,49 +310,105 @@ class ExecutionEngine:
         flow_id = execution_graph.get("flow_id", "unknown")
         execution_order: list[str] = execution_graph.get("execution_order", [])
         compiled_nodes: dict[str, Any] = execution_graph.get("compiled_nodes", {})
-        edges: list[dict[str, Any]] = execution_graph.get("edges", [])
 
         node_outputs: dict[str, str] = {}
         self._branch_decisions: dict[str, str] = {}
         skipped_nodes: set[str] = set()
 
+        # Nodes whose upstream nodes have all finished (or been skipped) run
+        # together; each round is awaited as a whole so events stay in
+        # execution order while independent branches overlap on the network.
+        plan = self._prepare(execution_graph)
+        position, incoming, children = plan.position, plan.incoming, plan.children
+        waiting = dict(plan.indegree)
+        ready = list(plan.roots)
+
+        deltas: asyncio.Queue[ExecutionEvent | None] = asyncio.Queue()
+
+        def emit_delta(node_id: str, text: str) -> None:
+            deltas.put_nowait(
+                ExecutionEvent(event_type="node_output_delta", node_id=node_id, flow_id=flow_id, data=text)
+            )
+
         yield ExecutionEvent(event_type="flow_start", flow_id=flow_id)
 
-        for node_id in execution_order:
-            compiled = compiled_nodes.get(node_id, {})
-            node_type = compiled.get("node_type", "unknown")
-
-            # Check if this node should be skipped due to branching
-            if self._should_skip(node_id, edges, skipped_nodes):
-                skipped_nodes.add(node_id)
-                yield ExecutionEvent(event_type="node_skipped", node_id=node_id, flow_id=flow_id)
-                continue
-
-            yield ExecutionEvent(event_type="node_start", node_id=node_id, flow_id=flow_id)
-
-            try:
-                result = await self._execute_node(
-                    node_id, node_type, compiled, edges, node_outputs, user_input
-                )
-                node_outputs[node_id] = result
-
-                yield ExecutionEvent(
-                    event_type="node_output",
-                    node_id=node_id,
-                    flow_id=flow_id,
-                    data=result,
-                )
-                yield ExecutionEvent(event_type="node_complete", node_id=node_id, flow_id=flow_id)
-
-            except Exception as e:
-                logger.exception("Node '%s' failed", node_id)
-                yield ExecutionEvent(
-                    event_type="error",
-                    node_id=node_id,
-                    flow_id=flow_id,
-                    message=str(e),
-                )
-                return
+        gathered: asyncio.Future[list[Any]] | None = None
+        try:
+            while ready:
+                batch = sorted(ready, key=position.__getitem__)
+                ready = []
+                runnable: list[str] = []
+
+                for node_id in batch:
+                    # Check if this node should be skipped due to branching
+                    if self._should_skip(node_id, incoming, skipped_nodes):
+                        skipped_nodes.add(node_id)
+                        yield ExecutionEvent(event_type="node_skipped", node_id=node_id, flow_id=flow_id)
+                    else:
+                        runnable.append(node_id)
+
+                for node_id in runnable:
+                    yield ExecutionEvent(event_type="node_start", node_id=node_id, flow_id=flow_id)
+
+                tasks = []
+                for node_id in runnable:
+                    compiled = compiled_nodes.get(node_id, {})
+                    node_type = compiled.get("node_type", "unknown")
+                    tasks.append(
+                        self._execute_node(
+                            node_id, node_type, compiled, incoming, node_outputs, user_input,
+                            on_delta=functools.partial(emit_delta, node_id),
+                        )
+                    )
+                gathered = asyncio.gather(*tasks, return_exceptions=True)
+                # Forward streamed deltas while the round runs; None marks its end
+                gathered.add_done_callback(lambda _: deltas.put_nowait(None))
+                while (delta_event := await deltas.get()) is not None:
+                    yield delta_event
+                results = gathered.result()
+
+                for result in results:
+                    if isinstance(result, BaseException) and not isinstance(result, Exception):
+                        raise result
+
+                # Every node in the round gets a terminal event, so a failure
+                # doesn't leave its siblings shown as running; the flow stops after
+                failed = False
+                for node_id, result in zip(runnable, results):
+                    if isinstance(result, Exception):
+                        failed = True
+                        logger.error("Node '%s' failed", node_id, exc_info=result)
+                        yield ExecutionEvent(
+                            event_type="error",
+                            node_id=node_id,
+                            flow_id=flow_id,
+                            message=str(result),
+                        )
+                        continue
+
+                    node_outputs[node_id] = result
+                    yield ExecutionEvent(
+                        event_type="node_output",
+                        node_id=node_id,
+                        flow_id=flow_id,
+                        data=result,
+                    )
+                    yield ExecutionEvent(event_type="node_complete", node_id=node_id, flow_id=flow_id)
+
+                if failed:
+                    return
+
+                for node_id in batch:
+                    for child in children[node_id]:
+                        waiting[child] -= 1
+                        if waiting[child] == 0:
+                            ready.append(child)
+        finally:
+            # The consumer may stop early (e.g. the websocket send failed);
+            # don't leave the round's provider calls running unobserved
+            if gathered is not None and not gathered.done():
+                gathered.cancel()
+                await asyncio.gather(gathered, return_exceptions=True)
 
         yield ExecutionEvent(
             event_type="flow_complete",
@@ -123,7 +419,7 @@ class ExecutionEngine:
     def _should_skip(
         self,
         node_id: str,
-        edges: list[dict[str, Any]],
+        incoming: dict[str, list[dict[str, Any]]],
         skipped_nodes: set[str],
     ) -> bool:
         """Check if a node should be skipped because it's on a non-taken branch.
@@ -132,11 +428,11 @@ class ExecutionEngine:
         1. A conditional node via the non-taken branch handle, or
         2. An already-skipped node (cascading skip).
         """
-        incoming = [e for e in edges if e["target"] == node_id]
-        if not incoming:
+        node_incoming = incoming.get(node_id)
+        if not node_incoming:
             return False  # Root nodes always run
 
-        for edge in incoming:
+        for edge in node_incoming:
             source = edge["source"]
             source_handle = edge.get("source_handle")
 
@@ -161,57 +457,58 @@ class ExecutionEngine:
         node_id: str,
         node_type: str,
         compiled: dict[str, Any],
-        edges: list[dict[str, Any]],
+        incoming: dict[str, list[dict[str, Any]]],
         node_outputs: dict[str, str],
         user_input: str,
+        on_delta: Callable[[str], None] | None = None,
     ) -> str:
-        """Execute a single compiled node and return its output string."""
+        """Execute a single compiled node and return its output string.
+
+        Agent nodes stream their response through ``on_delta`` as it arrives.
+        """
 
         if node_type == "input":
             return user_input or compiled.get("value", "")
 
         if node_type == "output":
-            return _get_upstream_output(node_id, edges, node_outputs)
+            return _get_upstream_output(node_id, incoming, node_outputs)
 
         if node_type in ("agent", "web_search"):
             agent = compiled.get("agent")
             if agent is None:
                 raise ValueError(f"Node '{node_id}' has no compiled agent")
 
-            upstream = _get_upstream_output(node_id, edges, node_outputs)
-            response = await agent.arun(upstream)
-            return response.content or ""
+            upstream = _get_upstream_output(node_id, incoming, node_outputs)
+            return await self._run_agent(
+                agent, upstream, cache_bust=compiled.get("cache_bust", False), on_delta=on_delta
+            )
 
         if node_type == "conditional":
-            return await self._execute_conditional(node_id, compiled, edges, node_outputs)
+            return await self._execute_conditional(node_id, compiled, incoming, node_outputs)
 
         if node_type == "knowledge_base":
-            return await self._execute_knowledge_base(node_id, compiled, edges, node_outputs)
+            return await self._execute_knowledge_base(node_id, compiled, incoming, node_outputs)
 
         # External integrations (return structured data as JSON strings)
         if node_type == "firecrawl_scrape":
-            upstream = _get_upstream_output(node_id, edges, node_outputs)
+            upstream = _get_upstream_output(node_id, incoming, node_outputs)
             result = await self._execute_firecrawl_scrape(compiled, {"data": upstream})
-            import json
-            return json.dumps(result)
+            return orjson.dumps(result).decode()
 
         if node_type == "apify_actor":
-            upstream = _get_upstream_output(node_id, edges, node_outputs)
+            upstream = _get_upstream_output(node_id, incoming, node_outputs)
             result = await self._execute_apify_actor(compiled, {"data": upstream})
-            import json
-            return json.dumps(result)
+            return orjson.dumps(result).decode()
 
         if node_type == "mcp_server":
-            upstream = _get_upstream_output(node_id, edges, node_outputs)
+            upstream = _get_upstream_output(node_id, incoming, node_outputs)
             result = await self._execute_mcp_server(compiled, {"data": upstream})
-            import json
-            return json.dumps(result)
+            return orjson.dumps(result).decode()
 
         if node_type == "huggingface_inference":
-            upstream = _get_upstream_output(node_id, edges, node_outputs)
+            upstream = _get_upstream_output(node_id, incoming, node_outputs)
             result = await self._execute_huggingface_inference(compiled, {"data": upstream})
-            import json
-            return json.dumps(result)
+            return orjson.dumps(result).decode()
 
         return f"[Unhandled node type: {node_type}]"
 
@@ -219,40 +516,65 @@ class ExecutionEngine:
         self,
         node_id: str,
         compiled: dict[str, Any],
-        edges: list[dict[str, Any]],
+        incoming: dict[str, list[dict[str, Any]]],
         node_outputs: dict[str, str],
     ) -> str:
         """Evaluate a condition. Returns upstream data; stores branch decision."""
-        upstream = _get_upstream_output(node_id, edges, node_outputs)
+        upstream = _get_upstream_output(node_id, incoming, node_outputs)
         condition = compiled.get("condition", "")
 
         if self._condition_evaluator:
             # Test-injectable evaluator
             branch = self._condition_evaluator(upstream, condition)
         else:
-            from agno.agent import Agent
-            from agno.models.openai import OpenAIChat
-
-            evaluator = Agent(
-                model=OpenAIChat(id="gpt-4o-mini"),
-                instructions=(
-                    "You are a condition evaluator. Given the context and condition below, "
-                    "respond with ONLY 'true' or 'false'. Nothing else.\n\n"
-                    f"Condition: {condition}"
-                ),
-            )
-            resp = await evaluator.arun(upstream)
-            result = (resp.content or "").strip().lower()
+            evaluator = self._build_evaluator(condition)
+            response = await self._run_agent(evaluator, upstream, cache_bust=compiled.get("cache_bust", False))
+            result = response.strip().lower()
             branch = "true" if result.startswith("true") else "false"
 
         self._branch_decisions[node_id] = branch
         return upstream
 
+    @staticmethod
+    def _build_evaluator(condition: str) -> Agent:
+        """Condition-evaluator agent; built per call so runs never share agent state."""
+        return Agent(
+            model=OpenAIChat(id="gpt-4o-mini"),
+            instructions=_EVALUATOR_INSTRUCTIONS.format(condition=condition),
+        )
+
+    @staticmethod
+    def _build_rag_agent(knowledge: Any) -> Agent:
+        """RAG agent over a knowledge object; built per call like the evaluator."""
+        return Agent(
+            model=OpenAIChat(id="gpt-4o-mini"),
+            knowledge=knowledge,
+            instructions=_RAG_INSTRUCTIONS,
+            search_knowledge=True,
+        )
+
+    async def _ensure_knowledge_loaded(self, node_id: str, knowledge: Any) -> None:
+        """Load a knowledge base once per knowledge object, off the event loop."""
+        key = id(knowledge)
+        ref = self._loaded_knowledge.get(key)
+        if ref is not None and ref() is knowledge:
+            return
+
+        # Idempotent (skips if already loaded), so a concurrent duplicate is harmless
+        try:
+            await asyncio.to_thread(knowledge.load, recreate=False)
+        except Exception as e:
+            logger.warning("KB load failed for node '%s': %s", node_id, e)
+
+        self._loaded_knowledge[key] = weakref.ref(
+            knowledge, lambda _: self._loaded_knowledge.pop(key, None)
+        )
+
     async def _execute_knowledge_base(
         self,
         node_id: str,
         compiled: dict[str, Any],
-        edges: list[dict[str, Any]],
+        incoming: dict[str, list[dict[str, Any]]],
         node_outputs: dict[str, str],
     ) -> str:
         """Execute a Knowledge Base RAG query using an Agno Agent with Knowledge."""
@@ -266,64 +588,56 @@ class ExecutionEngine:
         # Load documents asynchronously if sources are provided
         sources = compiled.get("sources", [])
         if sources:
-            from app.services.source_detector import SourceDetector, SourceType
-
             logger.info(f"Loading {len(sources)} sources into knowledge base...")
-            loaded_count = 0
-            for source in sources:
-                try:
-                    source_type = SourceDetector.detect(source)
-
-                    if source_type == SourceType.FILE:
-                        await knowledge.add_content_async(path=source)
-                    elif source_type == SourceType.WEBSITE:
-                        await knowledge.add_content_async(url=source)
-                    elif source_type == SourceType.YOUTUBE:
-                        await knowledge.add_content_async(url=source)
-
-                    logger.info(f"Loaded {source_type.value}: {source}")
-                    loaded_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to load source '{source}': {e}")
-                    # Continue with remaining sources
+            load_limit = asyncio.Semaphore(self.KB_LOAD_CONCURRENCY)
+            loaded = await asyncio.gather(
+                *(self._load_kb_source(knowledge, source, load_limit) for source in sources)
+            )
+            loaded_count = sum(loaded)
 
             if loaded_count > 0:
                 logger.info(f"Successfully loaded {loaded_count}/{len(sources)} sources")
             else:
                 logger.warning("No sources loaded successfully")
 
-        from agno.agent import Agent
-        from agno.models.openai import OpenAIChat
+        upstream = _get_upstream_output(node_id, incoming, node_outputs)
 
-        upstream = _get_upstream_output(node_id, edges, node_outputs)
+        await self._ensure_knowledge_loaded(node_id, knowledge)
+        rag_agent = self._build_rag_agent(knowledge)
 
-        # Create an agent with the knowledge base attached for RAG
-        rag_agent = Agent(
-            model=OpenAIChat(id="gpt-4o-mini"),
-            knowledge=knowledge,
-            instructions=(
-                "You are a helpful assistant. Answer the user's question using the "
-                "knowledge base provided. If you cannot find the answer in the knowledge "
-                "base, say so clearly."
-            ),
-            search_knowledge=True,
-        )
+        # Not coalesced: the call key doesn't cover the attached knowledge
+        _use_shared_http_client(rag_agent)
+        async with self._semaphore:
+            resp = await rag_agent.arun(upstream)
+        return resp.content or ""
+
+    @staticmethod
+    async def _load_kb_source(knowledge: Any, source: str, limit: asyncio.Semaphore) -> bool:
+        """Add one source to the knowledge base; returns whether it loaded.
 
-        # Load the knowledge base (idempotent — skips if already loaded)
+        Failures are logged and swallowed so one bad source doesn't stop the rest.
+        """
         try:
-            rag_agent.knowledge.load(recreate=False)  # type: ignore[union-attr]
+            source_type = SourceDetector.detect(source)
+
+            async with limit:
+                if source_type == SourceType.FILE:
+                    await knowledge.add_content_async(path=source)
+                elif source_type == SourceType.WEBSITE:
+                    await knowledge.add_content_async(url=source)
+                elif source_type == SourceType.YOUTUBE:
+                    await knowledge.add_content_async(url=source)
+
+            logger.info(f"Loaded {source_type.value}: {source}")
+            return True
         except Exception as e:
-            logger.warning("KB load failed for node '%s': %s", node_id, e)
-
-        resp = await rag_agent.arun(upstream)
-        return resp.content or ""
+            logger.warning(f"Failed to load source '{source}': {e}")
+            return False
 
     async def _execute_firecrawl_scrape(
         self, compiled_node: dict[str, Any], upstream_output: dict[str, Any]
     ) -> dict[str, Any]:
         """Execute Firecrawl Scrape node (stub for now)."""
-        from app.services.output_normalizer import OutputEnvelope
-
         # TODO: Implement real Firecrawl API call
         # from firecrawl import FirecrawlApp
         # app = FirecrawlApp(api_key=resolved_api_key)
@@ -341,8 +655,6 @@ class ExecutionEngine:
         self, compiled_node: dict[str, Any], upstream_output: dict[str, Any]
     ) -> dict[str, Any]:
         """Execute Apify Actor node (stub for now)."""
-        from app.services.output_normalizer import OutputEnvelope
-
         # TODO: Implement real Apify API call with polling
 
         return OutputEnvelope.wrap(
@@ -356,8 +668,6 @@ class ExecutionEngine:
         self, compiled_node: dict[str, Any], upstream_output: dict[str, Any]
     ) -> dict[str, Any]:
         """Execute MCP Server node (stub for now)."""
-        from app.services.output_normalizer import OutputEnvelope
-
         # TODO: Implement MCP client connection and agent execution
 
         return OutputEnvelope.wrap(
@@ -371,8 +681,6 @@ class ExecutionEngine:
         self, compiled_node: dict[str, Any], upstream_output: dict[str, Any]
     ) -> dict[str, Any]:
         """Execute Hugging Face Inference node (stub for now)."""
-        from app.services.output_normalizer import OutputEnvelope
-
         # TODO: Implement real HF Inference API call
 
         return OutputEnvelope.wrap(
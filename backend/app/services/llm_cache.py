@@ -0,0 +1,45 @@
+"""In-process cache of LLM responses for repeated agent runs."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from cachetools import TTLCache
+
+
+class LLMCache:
+    """
+    Bounded, short-lived store of agent responses keyed by call identity.
+
+    Re-running an unchanged flow (common while editing on the canvas) sends
+    the same prompt to the same agent; a hit skips the provider round trip
+    entirely. Entries expire after ``ttl`` seconds so tool-backed agents
+    (e.g. web search) don't serve stale results indefinitely.
+
+    Example:
+        cache = LLMCache()
+        cache.set(key, "response text")
+        cache.get(key)  # "response text" until the TTL runs out
+    """
+
+    MAX_SIZE = 4096
+    DEFAULT_TTL = 300  # seconds
+
+    def __init__(self, maxsize: int = MAX_SIZE, ttl: float = DEFAULT_TTL) -> None:
+        self._entries: TTLCache[bytes, str] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached response, or None on a miss."""
+        return self._entries.get(key)
+
+    def set(self, key: bytes, value: str) -> None:
+        """Store a response under key."""
+        self._entries[key] = value
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+
+
+# Shared by every ExecutionEngine unless one is injected
+llm_cache = LLMCache()
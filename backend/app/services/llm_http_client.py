@@ -0,0 +1,50 @@
+"""
+Shared HTTP connection pool for LLM provider calls.
+
+The execution engine hands this client to every OpenAI-backed Agno model
+it runs, so parallel and repeated calls reuse kept-alive TLS connections
+instead of each model opening its own.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import httpx
+
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE = 32
+HTTP_KEEPALIVE_EXPIRY = 30.0
+# The OpenAI SDK's own defaults; long generations can take minutes
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """
+    Create (once) and return the shared async client for LLM providers.
+
+    HTTP/1.1 on purpose: Agno leaves OpenAI on the SDK's HTTP/1.1 default
+    because of transient HTTP/2 errors from OpenAI's edge, so concurrency
+    comes from the pooled keep-alive connections instead.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _http_client
+
+
+async def close_llm_http_client() -> None:
+    """Close the shared client's connection pool (app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
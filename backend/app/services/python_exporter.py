@@ -4,18 +4,70 @@ Python code generator for CoconutFlow workflows.
 Converts FlowDefinition JSON into executable Python scripts using Agno SDK.
 """
 from __future__ import annotations
+import bisect
+import io
+from collections import Counter, defaultdict, deque
 from typing import Dict, List, Set
-from datetime import datetime
+from datetime import datetime, timezone
 
 from app.models.flow import FlowDefinition, FlowNode, NodeType
+from app.services.source_detector import SourceDetector, SourceType
 
 
 class PythonExporter:
     """Generates Python code from workflow definitions."""
 
+    _VAR_TRANS = str.maketrans({"-": "_", ".": "_"})
+
+    # Static parts of every exported script; only the header is formatted
+    _HEADER_TMPL = (
+        "#!/usr/bin/env python3\n"
+        '"""\n'
+        "{name}\n"
+        "\n"
+        "Description: {desc}\n"
+        "Generated from CoconutFlow on {ts} UTC\n"
+        '"""\n'
+        "\n"
+    )
+    _MAIN_DEF = (
+        "async def run_workflow(user_input: str):\n"
+        '    """Execute the workflow with given input."""\n'
+    )
+    _FOOTER = (
+        "\n"
+        "\n"
+        'if __name__ == "__main__":\n'
+        "    import sys\n"
+        "    \n"
+        "    if len(sys.argv) < 2:\n"
+        '        print("Usage: python workflow.py <input_text>")\n'
+        "        sys.exit(1)\n"
+        "    \n"
+        "    input_text = sys.argv[1]\n"
+        "    result = asyncio.run(run_workflow(input_text))\n"
+        '    print(f"\\nFinal Result: {result}")'
+    )
+
     def __init__(self):
-        self.imports: Set[str] = set()
-        self.node_code: List[str] = []
+        self.imports: List[str] = []  # Kept sorted by _add_import
+        self._buf = io.StringIO()  # Body of run_workflow, one write per node
+        self._var_cache: Dict[str, str] = {}
+        self._pred: Dict[str, str] = {}  # node id -> first upstream node id
+        self._assigned: Set[str] = set()  # node ids whose variable the script defines
+        # Bound once; _generate_node_code runs per node
+        self._handlers = {
+            NodeType.INPUT: self._gen_input,
+            NodeType.AGENT: self._gen_agent,
+            NodeType.TOOL: self._gen_web_search,  # Assuming web search is a tool type
+            NodeType.KNOWLEDGE_BASE: self._gen_knowledge_base,
+            NodeType.CONDITIONAL: self._gen_conditional,
+            NodeType.OUTPUT: self._gen_output,
+            NodeType.FIRECRAWL_SCRAPE: self._gen_firecrawl,
+            NodeType.APIFY_ACTOR: self._gen_apify,
+            NodeType.MCP_SERVER: self._gen_mcp,
+            NodeType.HUGGINGFACE_INFERENCE: self._gen_huggingface,
+        }
 
     def generate(self, flow: FlowDefinition) -> str:
         """
@@ -28,11 +80,13 @@ class PythonExporter:
             Python code as string
         """
         self.imports.clear()
-        self.node_code.clear()
+        self._buf = io.StringIO()
+        self._var_cache.clear()
+        self._assigned.clear()
 
         # Always import base requirements
-        self.imports.add("import asyncio")
-        self.imports.add("from agno.agent import Agent")
+        self._add_import("import asyncio")
+        self._add_import("from agno.agent import Agent")
 
         # Topological sort (same as compiler)
         sorted_nodes = self._topological_sort(flow)
@@ -45,61 +99,53 @@ class PythonExporter:
         return self._build_script(flow)
 
     def _topological_sort(self, flow: FlowDefinition) -> List[FlowNode]:
-        """Sort nodes in execution order."""
-        # Build adjacency map
-        graph = {node.id: [] for node in flow.nodes}
-        in_degree = {node.id: 0 for node in flow.nodes}
+        """Sort nodes in execution order (also records each node's upstream)."""
+        node_map = {n.id: n for n in flow.nodes}
 
+        # Adjacency lists only for nodes that actually have outgoing edges
+        graph: Dict[str, List[str]] = defaultdict(list)
+        # Counter reads 0 for nodes without incoming edges
+        in_degree: Counter[str] = Counter()
+        pred = self._pred
+        pred.clear()
         for edge in flow.edges:
             graph[edge.source].append(edge.target)
             in_degree[edge.target] += 1
+            pred.setdefault(edge.target, edge.source)
 
-        # Kahn's algorithm
-        queue = [nid for nid in in_degree if in_degree[nid] == 0]
-        sorted_ids = []
+        # Kahn's algorithm (deque: O(1) dequeue, O(V+E) overall)
+        queue = deque(nid for nid in node_map if in_degree[nid] == 0)
+        sorted_nodes = []
 
         while queue:
-            current = queue.pop(0)
-            sorted_ids.append(current)
+            current = queue.popleft()
+            sorted_nodes.append(node_map[current])
 
-            for neighbor in graph[current]:
+            for neighbor in graph.get(current, ()):
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
 
-        # Map back to nodes
-        node_map = {n.id: n for n in flow.nodes}
-        return [node_map[nid] for nid in sorted_ids]
+        return sorted_nodes
 
     def _generate_node_code(self, node: FlowNode):
         """Generate code for a single node."""
-        handlers = {
-            NodeType.INPUT: self._gen_input,
-            NodeType.AGENT: self._gen_agent,
-            NodeType.TOOL: self._gen_web_search,  # Assuming web search is a tool type
-            NodeType.KNOWLEDGE_BASE: self._gen_knowledge_base,
-            NodeType.CONDITIONAL: self._gen_conditional,
-            NodeType.OUTPUT: self._gen_output,
-            NodeType.FIRECRAWL_SCRAPE: self._gen_firecrawl,
-            NodeType.APIFY_ACTOR: self._gen_apify,
-            NodeType.MCP_SERVER: self._gen_mcp,
-            NodeType.HUGGINGFACE_INFERENCE: self._gen_huggingface,
-        }
-
-        handler = handlers.get(node.type)
+        handler = self._handlers.get(node.type)
         if handler:
             handler(node)
 
     def _gen_input(self, node: FlowNode):
         """Generate input node code."""
-        self.node_code.append(f"    # {node.label}")
-        self.node_code.append(f"    print(f'Input: {{user_input}}')")
-        self.node_code.append(f"    {self._var_name(node.id)} = user_input")
-        self.node_code.append("")
+        self._buf.write(
+            f"    # {node.label}\n"
+            f"    print(f'Input: {{user_input}}')\n"
+            f"    {self._bind_var(node.id)} = user_input\n"
+            "\n"
+        )
 
     def _gen_agent(self, node: FlowNode):
         """Generate LLM agent code."""
-        self.imports.add("from agno.agent import Agent")
+        self._add_import("from agno.agent import Agent")
 
         if not node.config.agent:
             return
@@ -113,55 +159,79 @@ class PythonExporter:
         else:
             instr_str = config.system_prompt or "You are a helpful assistant."
 
-        self.node_code.append(f"    # {node.label}")
-        self.node_code.append(f"    agent_{self._var_name(node.id)} = Agent(")
-        self.node_code.append(f"        name='{node.label}',")
-        self.node_code.append(f"        model='{model}',")
-        self.node_code.append(f"        instructions='{instr_str}',")
-        self.node_code.append(f"    )")
-
-        # Get upstream data
         upstream_var = self._get_upstream_var(node.id)
-        self.node_code.append(f"    response_{self._var_name(node.id)} = await agent_{self._var_name(node.id)}.run(str({upstream_var}))")
-        self.node_code.append(f"    {self._var_name(node.id)} = response_{self._var_name(node.id)}.content")
-        self.node_code.append("")
+        vn = self._bind_var(node.id)
+        self._buf.write(
+            f"    # {node.label}\n"
+            f"    agent_{vn} = Agent(\n"
+            f"        name='{node.label}',\n"
+            f"        model='{model}',\n"
+            f"        instructions='{instr_str}',\n"
+            f"    )\n"
+            f"    response_{vn} = await agent_{vn}.run(str({upstream_var}))\n"
+            f"    {vn} = response_{vn}.content\n"
+            "\n"
+        )
 
     def _gen_web_search(self, node: FlowNode):
         """Generate web search code."""
-        self.imports.add("from agno.tools.duckduckgo import DuckDuckGoTools")
-
-        self.node_code.append(f"    # {node.label}")
-        self.node_code.append(f"    search_tool = DuckDuckGoTools()")
+        self._add_import("from agno.tools.duckduckgo import DuckDuckGoTools")
 
         upstream_var = self._get_upstream_var(node.id)
-        self.node_code.append(f"    results = search_tool.search(str({upstream_var}), max_results=5)")
-        self.node_code.append(f"    {self._var_name(node.id)} = str(results)")
-        self.node_code.append("")
+        self._buf.write(
+            f"    # {node.label}\n"
+            f"    search_tool = DuckDuckGoTools()\n"
+            f"    results = search_tool.search(str({upstream_var}), max_results=5)\n"
+            f"    {self._bind_var(node.id)} = str(results)\n"
+            "\n"
+        )
 
     def _gen_knowledge_base(self, node: FlowNode):
         """Generate knowledge base code."""
-        self.imports.add("from agno.knowledge import Knowledge")
-        self.imports.add("from agno.vectordb.pgvector import PgVector")
+        self._add_import("from agno.knowledge import Knowledge")
+        self._add_import("from agno.vectordb.pgvector import PgVector")
 
         if not node.config.knowledge_base:
             return
 
         config = node.config.knowledge_base
-
-        self.node_code.append(f"    # {node.label}")
-        self.node_code.append(f"    kb_{self._var_name(node.id)} = Knowledge(")
-        self.node_code.append(f"        name='{node.label}',")
-        self.node_code.append(f"        vector_db=PgVector()")
-        self.node_code.append(f"    )")
-
-        # Add sources
-        for source in config.sources:
-            self.node_code.append(f"    await kb_{self._var_name(node.id)}.add_content_async(path='{source}')")
-
         upstream_var = self._get_upstream_var(node.id)
-        self.node_code.append(f"    results = kb_{self._var_name(node.id)}.search(str({upstream_var}))")
-        self.node_code.append(f"    {self._var_name(node.id)} = str(results)")
-        self.node_code.append("")
+        vn = self._bind_var(node.id)
+
+        # Files load by path, websites/YouTube by URL (as in the execution
+        # engine); several sources are ingested concurrently
+        loads = [
+            f"kb_{vn}.add_content_async({self._source_kwarg(source)}='{source}')"
+            for source in config.sources
+        ]
+        if len(loads) > 1:
+            add_sources = (
+                "    await asyncio.gather(\n"
+                + "".join(f"        {load},\n" for load in loads)
+                + "    )\n"
+            )
+        else:
+            add_sources = "".join(f"    await {load}\n" for load in loads)
+        self._buf.write(
+            f"    # {node.label}\n"
+            f"    kb_{vn} = Knowledge(\n"
+            f"        name='{node.label}',\n"
+            f"        vector_db=PgVector()\n"
+            f"    )\n"
+            f"{add_sources}"
+            f"    results = kb_{vn}.search(str({upstream_var}))\n"
+            f"    {vn} = str(results)\n"
+            "\n"
+        )
+
+    @staticmethod
+    def _source_kwarg(source: str) -> str:
+        """Keyword add_content_async takes for this source (invalid ones fall back to path)."""
+        try:
+            is_file = SourceDetector.detect(source) == SourceType.FILE
+        except ValueError:
+            is_file = True
+        return "path" if is_file else "url"
 
     def _gen_conditional(self, node: FlowNode):
         """Generate conditional code."""
@@ -171,96 +241,93 @@ class PythonExporter:
         config = node.config.conditional
         condition = config.condition_expression or "true"
 
-        self.node_code.append(f"    # {node.label} - Conditional")
         upstream_var = self._get_upstream_var(node.id)
-        self.node_code.append(f"    # TODO: Evaluate condition: {condition}")
-        self.node_code.append(f"    condition_result = True  # Placeholder")
-        self.node_code.append(f"    {self._var_name(node.id)} = {upstream_var} if condition_result else None")
-        self.node_code.append("")
+        self._buf.write(
+            f"    # {node.label} - Conditional\n"
+            f"    # TODO: Evaluate condition: {condition}\n"
+            f"    condition_result = True  # Placeholder\n"
+            f"    {self._bind_var(node.id)} = {upstream_var} if condition_result else None\n"
+            "\n"
+        )
 
     def _gen_output(self, node: FlowNode):
         """Generate output code."""
         upstream_var = self._get_upstream_var(node.id)
 
-        self.node_code.append(f"    # {node.label}")
-        self.node_code.append(f"    print(f'Output: {{{upstream_var}}}')")
-        self.node_code.append(f"    return {upstream_var}")
-        self.node_code.append("")
+        self._buf.write(
+            f"    # {node.label}\n"
+            f"    print(f'Output: {{{upstream_var}}}')\n"
+            f"    return {upstream_var}\n"
+            "\n"
+        )
+
+    def _gen_placeholder(self, node: FlowNode, title: str, integration: str, result: str):
+        """Generate a stub for integrations the exporter doesn't support yet."""
+        self._buf.write(
+            f"    # {node.label} - {title}\n"
+            f"    # TODO: Implement {integration} integration\n"
+            f"    {self._bind_var(node.id)} = '{result} result placeholder'\n"
+            "\n"
+        )
 
     def _gen_firecrawl(self, node: FlowNode):
         """Generate Firecrawl scrape code."""
-        self.node_code.append(f"    # {node.label} - Firecrawl Scrape")
-        self.node_code.append(f"    # TODO: Implement Firecrawl integration")
-        self.node_code.append(f"    {self._var_name(node.id)} = 'Firecrawl result placeholder'")
-        self.node_code.append("")
+        self._gen_placeholder(node, "Firecrawl Scrape", "Firecrawl", "Firecrawl")
 
     def _gen_apify(self, node: FlowNode):
         """Generate Apify actor code."""
-        self.node_code.append(f"    # {node.label} - Apify Actor")
-        self.node_code.append(f"    # TODO: Implement Apify integration")
-        self.node_code.append(f"    {self._var_name(node.id)} = 'Apify result placeholder'")
-        self.node_code.append("")
+        self._gen_placeholder(node, "Apify Actor", "Apify", "Apify")
 
     def _gen_mcp(self, node: FlowNode):
         """Generate MCP server code."""
-        self.node_code.append(f"    # {node.label} - MCP Server")
-        self.node_code.append(f"    # TODO: Implement MCP integration")
-        self.node_code.append(f"    {self._var_name(node.id)} = 'MCP result placeholder'")
-        self.node_code.append("")
+        self._gen_placeholder(node, "MCP Server", "MCP", "MCP")
 
     def _gen_huggingface(self, node: FlowNode):
         """Generate Hugging Face code."""
-        self.node_code.append(f"    # {node.label} - Hugging Face")
-        self.node_code.append(f"    # TODO: Implement Hugging Face integration")
-        self.node_code.append(f"    {self._var_name(node.id)} = 'HuggingFace result placeholder'")
-        self.node_code.append("")
+        self._gen_placeholder(node, "Hugging Face", "Hugging Face", "HuggingFace")
+
+    def _add_import(self, imp: str) -> None:
+        """Record an import line, keeping the list sorted and unique."""
+        if imp not in self.imports:
+            bisect.insort(self.imports, imp)
 
     def _var_name(self, node_id: str) -> str:
         """Convert node ID to valid Python variable name."""
-        return node_id.replace("-", "_").replace(".", "_")
+        name = self._var_cache.get(node_id)
+        if name is None:
+            name = self._var_cache[node_id] = node_id.translate(self._VAR_TRANS)
+        return name
+
+    def _bind_var(self, node_id: str) -> str:
+        """Variable name for a node whose generated code assigns it."""
+        self._assigned.add(node_id)
+        return self._var_name(node_id)
 
     def _get_upstream_var(self, node_id: str) -> str:
-        """Get variable name for upstream node (placeholder)."""
-        # In real implementation, look up actual upstream node
-        return "user_input"
+        """
+        Get variable name for the node's upstream.
+
+        Falls back to ``user_input`` for roots and for upstreams that emitted
+        no assignment (unconfigured or unsupported nodes).
+        """
+        upstream = self._pred.get(node_id)
+        if upstream is None or upstream not in self._assigned:
+            return "user_input"
+        return self._var_name(upstream)
 
     def _build_script(self, flow: FlowDefinition) -> str:
         """Build final Python script."""
-        lines = []
-
-        # Header
-        lines.append("#!/usr/bin/env python3")
-        lines.append('"""')
-        lines.append(f"{flow.name}")
-        lines.append("")
-        lines.append(f"Description: {flow.description or 'No description'}")
-        lines.append(f"Generated from CoconutFlow on {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
-        lines.append('"""')
-        lines.append("")
-
-        # Imports
-        for imp in sorted(self.imports):
-            lines.append(imp)
-        lines.append("")
-        lines.append("")
-
-        # Main function
-        lines.append("async def run_workflow(user_input: str):")
-        lines.append('    """Execute the workflow with given input."""')
-        lines.extend(self.node_code)
-        lines.append("")
-        lines.append("")
-
-        # CLI entrypoint
-        lines.append('if __name__ == "__main__":')
-        lines.append("    import sys")
-        lines.append("    ")
-        lines.append("    if len(sys.argv) < 2:")
-        lines.append('        print("Usage: python workflow.py <input_text>")')
-        lines.append("        sys.exit(1)")
-        lines.append("    ")
-        lines.append("    input_text = sys.argv[1]")
-        lines.append("    result = asyncio.run(run_workflow(input_text))")
-        lines.append('    print(f"\\nFinal Result: {result}")')
-
-        return "\n".join(lines)
+        out = io.StringIO()
+        out.write(self._HEADER_TMPL.format(
+            name=flow.name,
+            desc=flow.description or "No description",
+            # Naive so the stamp keeps its "YYYY-MM-DD HH:MM:SS UTC" form
+            ts=datetime.now(timezone.utc).replace(tzinfo=None).isoformat(" ", "seconds"),
+        ))
+        for imp in self.imports:
+            out.write(f"{imp}\n")
+        out.write("\n\n")
+        out.write(self._MAIN_DEF)
+        out.write(self._buf.getvalue())
+        out.write(self._FOOTER)
+        return out.getvalue()
@@ -5,21 +5,25 @@ Reads configuration from environment variables.
 
 from __future__ import annotations
 
+import asyncio
+import importlib
 import os
 from functools import lru_cache
+from typing import Any
 
 from dotenv import load_dotenv
+from fastapi import Request
 
 load_dotenv()
 
+# Connection pool for the shared async client (HTTP/2 multiplexes requests
+# over the kept-alive connections)
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE = 25
+HTTP_KEEPALIVE_EXPIRY = 30.0
+HTTP_TIMEOUT = 120.0  # Matches postgrest's default client timeout
 
-@lru_cache(maxsize=1)
-def get_supabase_client():
-    """
-    Create and return a cached Supabase client instance.
-
-    Requires SUPABASE_URL and SUPABASE_ANON_KEY environment variables.
-    """
+def _read_credentials() -> tuple[str, str]:
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_ANON_KEY")
 
@@ -28,8 +32,98 @@ def get_supabase_client():
             "SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment. "
             "Copy .env.example to .env and fill in your Supabase credentials."
         )
+    return url, key
+
+
+def preload_supabase() -> None:
+    """Import the supabase package up front (e.g. at startup).
+
+    The import pulls in postgrest, storage3, gotrue and friends; doing it
+    here keeps that cost off the first request that needs a client.
+    """
+    importlib.import_module("supabase")
+
+
+@lru_cache(maxsize=1)
+def get_supabase_client():
+    """
+    Create and return a cached (synchronous) Supabase client instance.
+
+    Intended for scripts and other code running outside the event loop;
+    API routes use get_async_supabase_client() instead.
+
+    Requires SUPABASE_URL and SUPABASE_ANON_KEY environment variables.
+    """
+    url, key = _read_credentials()
 
     from supabase import create_client, Client
 
     client: Client = create_client(url, key)
     return client
+
+
+class AsyncSupabaseHolder:
+    """
+    Lazily created async Supabase client plus its pooled HTTP client.
+
+    One holder is created per app in the lifespan (``app.state.supabase``),
+    so the client and its connections belong to the event loop that serves
+    requests and are closed when that loop shuts down.
+    """
+
+    def __init__(self) -> None:
+        self._client: Any = None
+        self._http_client: Any = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Any:
+        """Create (once) and return the async client."""
+        if self._client is not None:
+            return self._client
+
+        async with self._lock:
+            if self._client is None:
+                url, key = _read_credentials()
+
+                import httpx
+                from supabase import AsyncClientOptions, acreate_client
+
+                self._http_client = httpx.AsyncClient(
+                    http2=True,
+                    follow_redirects=True,
+                    timeout=HTTP_TIMEOUT,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                )
+                self._client = await acreate_client(
+                    url, key, options=AsyncClientOptions(httpx_client=self._http_client)
+                )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the connection pool (app shutdown)."""
+        async with self._lock:
+            if self._http_client is not None:
+                await self._http_client.aclose()
+            self._client = None
+            self._http_client = None
+
+
+async def get_async_supabase_client(request: Request) -> Any:
+    """
+    Return the app's shared async Supabase client.
+
+    Used as a FastAPI dependency (``Depends(get_async_supabase_client)``) so
+    every request shares one client and its pooled keep-alive HTTP
+    connections, and ``await query.execute()`` never blocks the event loop.
+
+    Requires SUPABASE_URL and SUPABASE_ANON_KEY environment variables, and
+    the app lifespan to have run (``with TestClient(app)`` in tests).
+    """
+    holder: AsyncSupabaseHolder | None = getattr(request.app.state, "supabase", None)
+    if holder is None:
+        raise RuntimeError("Supabase client is not available: the app lifespan has not started")
+    return await holder.get()
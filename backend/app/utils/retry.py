@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
+from asyncio import sleep as _sleep
 from functools import wraps
 from typing import Any, Callable, TypeVar
 
@@ -36,6 +36,9 @@ def retry_with_backoff(
             response = await http_client.get(url)
             return response.json()
     """
+    # Sleep before retry n+1 is delays[n - 1]; fixed at decoration time
+    delays = tuple(min(base_delay * (1 << i), max_delay) for i in range(max_attempts - 1))
+
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -45,19 +48,18 @@ def retry_with_backoff(
                 except exceptions as e:
                     if attempt == max_attempts:
                         logger.error(
-                            f"{func.__name__} failed after {max_attempts} attempts: {e}"
+                            "%s failed after %d attempts: %s", func.__name__, max_attempts, e
                         )
                         raise
 
-                    # Calculate exponential backoff delay
-                    delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
+                    delay = delays[attempt - 1]
 
                     logger.warning(
-                        f"{func.__name__} attempt {attempt} failed: {e}. "
-                        f"Retrying in {delay:.1f}s..."
+                        "%s attempt %d failed: %s. Retrying in %.1fs...",
+                        func.__name__, attempt, e, delay,
                     )
 
-                    await asyncio.sleep(delay)
+                    await _sleep(delay)
 
             # This should never be reached but satisfies type checker
             raise RuntimeError("Retry logic error")
@@ -0,0 +1,60 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import flows
+from app.main import app
+from app.services.supabase_client import get_async_supabase_client
+from tests.fake_supabase import FakeSupabase
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-external",
+        action="store_true",
+        default=False,
+        help="run tests marked external (real vector DB / embedding API)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "external: needs a real Postgres/pgvector database or network APIs"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip external tests unless --run-external is given, even if their env is set."""
+    if config.getoption("--run-external"):
+        return
+    skip_external = pytest.mark.skip(reason="external test; pass --run-external to run")
+    for item in items:
+        if "external" in item.keywords:
+            item.add_marker(skip_external)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and one app startup/shutdown) for the whole run."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def large_text_content():
+    """11MB of readable text (over the 10MB warning threshold), built once per run."""
+    return b"x" * (11 * 1024 * 1024)
+
+
+@pytest.fixture
+def fake_supabase():
+    """In-memory Supabase behind the API routes, with the flow caches emptied."""
+    fake = FakeSupabase()
+    app.dependency_overrides[get_async_supabase_client] = lambda: fake
+    flows._flow_cache.clear()
+    flows._list_cache.clear()
+    yield fake
+    app.dependency_overrides.pop(get_async_supabase_client, None)
+    flows._flow_cache.clear()
+    flows._list_cache.clear()
@@ -0,0 +1,154 @@
+"""In-memory stand-in for the async Supabase client used by the API routes.
+
+Supports the query-builder calls the routers make (select/insert/upsert/
+update/delete with eq, is_, or_ and order) so endpoint tests can run via
+``app.dependency_overrides`` without a database.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import uuid
+from types import SimpleNamespace
+from typing import Any, Callable
+
+_clock = itertools.count(1)
+
+
+def _now() -> str:
+    """Strictly increasing timestamps, so every write changes updated_at."""
+    return f"2026-01-01T00:00:00.{next(_clock):06d}+00:00"
+
+
+def _split_or(expr: str) -> list[str]:
+    """Split a PostgREST or() filter on commas outside double quotes."""
+    parts, current, quoted = [], [], False
+    for char in expr:
+        if char == '"':
+            quoted = not quoted
+        if char == "," and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def _or_condition(part: str) -> Callable[[dict[str, Any]], bool]:
+    column, op, value = part.split(".", 2)
+    negate = op == "not"
+    if negate:
+        op, value = value.split(".", 1)
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if op == "is" and value == "null":
+        check = lambda row: row.get(column) is None  # noqa: E731
+    elif op == "eq":
+        check = lambda row: row.get(column) is not None and str(row.get(column)) == value  # noqa: E731
+    else:
+        raise NotImplementedError(f"or_ operator {op!r}")
+    return (lambda row: not check(row)) if negate else check
+
+
+class _Query:
+    def __init__(self, client: "FakeSupabase", table: str) -> None:
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns = "*"
+        self._payload: Any = None
+        self._ignore_duplicates = False
+        self._filters: list[Callable[[dict[str, Any]], bool]] = []
+        self._order: tuple[str, bool] | None = None
+
+    def select(self, columns: str = "*") -> "_Query":
+        self._columns = columns
+        return self
+
+    def insert(self, rows: Any) -> "_Query":
+        self._action, self._payload = "insert", rows
+        return self
+
+    def upsert(self, row: Any, on_conflict: str = "id", ignore_duplicates: bool = False) -> "_Query":
+        self._action, self._payload = "upsert", row
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: dict[str, Any]) -> "_Query":
+        self._action, self._payload = "update", values
+        return self
+
+    def delete(self) -> "_Query":
+        self._action = "delete"
+        return self
+
+    def eq(self, column: str, value: Any) -> "_Query":
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def is_(self, column: str, value: str) -> "_Query":
+        assert value == "null"
+        self._filters.append(lambda row: row.get(column) is None)
+        return self
+
+    def or_(self, expr: str) -> "_Query":
+        conditions = [_or_condition(part) for part in _split_or(expr)]
+        self._filters.append(lambda row: any(check(row) for check in conditions))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "_Query":
+        self._order = (column, desc)
+        return self
+
+    def _project(self, row: dict[str, Any]) -> dict[str, Any]:
+        if self._columns == "*":
+            return copy.deepcopy(row)
+        return {c.strip(): copy.deepcopy(row.get(c.strip())) for c in self._columns.split(",")}
+
+    async def execute(self) -> SimpleNamespace:
+        self._client.calls.append((self._table, self._action))
+        rows = self._client.tables.setdefault(self._table, [])
+        matched = [row for row in rows if all(f(row) for f in self._filters)]
+
+        if self._action == "select":
+            if self._order:
+                column, desc = self._order
+                matched.sort(key=lambda row: row.get(column) or "", reverse=desc)
+            return SimpleNamespace(data=[self._project(row) for row in matched])
+
+        if self._action in ("insert", "upsert"):
+            new_rows = self._payload if isinstance(self._payload, list) else [self._payload]
+            inserted = []
+            for new in new_rows:
+                if self._action == "upsert" and any(r["id"] == new.get("id") for r in rows):
+                    if self._ignore_duplicates:
+                        continue
+                    raise NotImplementedError("upsert without ignore_duplicates")
+                stamp = _now()
+                row = {"id": str(uuid.uuid4()), "created_at": stamp, "updated_at": stamp, **copy.deepcopy(new)}
+                rows.append(row)
+                inserted.append(copy.deepcopy(row))
+            return SimpleNamespace(data=inserted)
+
+        if self._action == "update":
+            for row in matched:
+                row.update(copy.deepcopy(self._payload))
+                row["updated_at"] = _now()
+            return SimpleNamespace(data=copy.deepcopy(matched))
+
+        # delete
+        self._client.tables[self._table] = [row for row in rows if row not in matched]
+        return SimpleNamespace(data=copy.deepcopy(matched))
+
+
+class FakeSupabase:
+    """Tables are plain lists of row dicts; ``calls`` records (table, action)."""
+
+    def __init__(self) -> None:
+        self.tables: dict[str, list[dict[str, Any]]] = {}
+        self.calls: list[tuple[str, str]] = []
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
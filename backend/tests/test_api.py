@@ -4,19 +4,14 @@ API endpoint tests using FastAPI TestClient.
 Tests: CRUD operations for flows, file upload, compilation endpoint.
 """
 
-import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
+import copy
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+import pytest
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_flow():
+    """Shared across the module; tests that change it work on a deepcopy."""
     return {
         "id": "test-flow-api",
         "name": "API Test Flow",
@@ -86,8 +81,9 @@ class TestFlowCRUD:
 
     def test_update_flow(self, client, sample_flow):
         client.post("/api/flows/", json=sample_flow)
-        sample_flow["name"] = "Updated Flow"
-        resp = client.put(f"/api/flows/{sample_flow['id']}", json=sample_flow)
+        flow = copy.deepcopy(sample_flow)
+        flow["name"] = "Updated Flow"
+        resp = client.put(f"/api/flows/{flow['id']}", json=flow)
         assert resp.status_code == 200
         assert resp.json()["name"] == "Updated Flow"
 
@@ -157,13 +153,11 @@ class TestFileUploadValidation:
         data = response.json()
         assert "empty" in data["detail"].lower()
 
-    def test_upload_large_file_includes_warning(self, client):
+    def test_upload_large_file_includes_warning(self, client, large_text_content):
         """Large files should return warning in response."""
-        large_content = b"x" * (11 * 1024 * 1024)  # 11MB
-
         response = client.post(
             "/api/upload/",
-            files={"file": ("large.txt", large_content, "text/plain")},
+            files={"file": ("large.txt", large_text_content, "text/plain")},
         )
 
         assert response.status_code == 200
@@ -172,6 +166,39 @@ class TestFileUploadValidation:
         assert len(data["warnings"]) > 0
         assert "large" in data["warnings"][0].lower()
 
+    def test_upload_oversized_request_rejected(self, client, monkeypatch, tmp_path):
+        """A Content-Length over the limit is refused before the body is read."""
+        from app.api import upload
+
+        monkeypatch.setattr(upload, "UPLOAD_DIR", tmp_path)
+        monkeypatch.setattr(upload, "MAX_FILE_SIZE", 1024)
+        monkeypatch.setattr(upload, "MULTIPART_OVERHEAD", 0)
+
+        response = client.post(
+            "/api/upload/",
+            files={"file": ("big.txt", b"x" * 4096, "text/plain")},
+        )
+
+        assert response.status_code == 413
+        assert list(tmp_path.iterdir()) == []
+
+    def test_upload_oversized_stream_removes_partial_file(self, client, monkeypatch, tmp_path):
+        """A body that passes the header check but streams past the limit leaves no file."""
+        from app.api import upload
+
+        monkeypatch.setattr(upload, "UPLOAD_DIR", tmp_path)
+        monkeypatch.setattr(upload, "MAX_FILE_SIZE", 1024)
+        monkeypatch.setattr(upload, "MULTIPART_OVERHEAD", 64 * 1024)
+        monkeypatch.setattr(upload, "CHUNK_SIZE", 512)
+
+        response = client.post(
+            "/api/upload/",
+            files={"file": ("big.txt", b"x" * 4096, "text/plain")},
+        )
+
+        assert response.status_code == 413
+        assert list(tmp_path.iterdir()) == []
+
 
 class TestPowerPointUpload:
     """Test PowerPoint file upload support."""
@@ -2,12 +2,11 @@
 
 import pytest
 from app.models.flow import FlowNode, NodeConfig, ApifyActorConfig
+from app.compiler.nodes.apify_actor_compiler import ApifyActorNodeCompiler
 
 
 def test_apify_actor_compiler_basic():
     """Test basic Apify Actor compilation."""
-    from app.compiler.nodes.apify_actor_compiler import ApifyActorNodeCompiler
-
     node = FlowNode(
         id="test-apify",
         type="apify_actor",
@@ -32,8 +31,6 @@ def test_apify_actor_compiler_basic():
 
 def test_apify_actor_compiler_timeout():
     """Test Apify Actor with custom timeout."""
-    from app.compiler.nodes.apify_actor_compiler import ApifyActorNodeCompiler
-
     node = FlowNode(
         id="test-timeout",
         type="apify_actor",
@@ -51,3 +48,23 @@ def test_apify_actor_compiler_timeout():
     result = compiler.compile(node, context={})
 
     assert result["timeout_secs"] == 600
+
+
+def test_apify_actor_compile_cached():
+    """Unchanged configs are served from the node cache; changed ones recompile."""
+    def make_node(max_items: int) -> FlowNode:
+        return FlowNode(
+            id="test-cached",
+            type="apify_actor",
+            config=NodeConfig(
+                apify_actor=ApifyActorConfig(actor_id="apify/web-scraper", max_items=max_items)
+            ),
+            position={"x": 0, "y": 0}
+        )
+
+    compiler = ApifyActorNodeCompiler()
+    first = compiler.compile_cached(make_node(10))
+    second = compiler.compile_cached(make_node(10))
+
+    assert second is first
+    assert compiler.compile_cached(make_node(20))["max_items"] == 20
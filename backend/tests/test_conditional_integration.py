@@ -1,9 +1,9 @@
 """Integration test — conditional branching over WebSocket (requires running server + OpenAI key)."""
 
 import asyncio
-import json
 import os
 
+import orjson
 import pytest
 
 # Skip if no API key — this is an integration test
@@ -12,73 +12,78 @@ pytestmark = pytest.mark.skipif(
     reason="OPENAI_API_KEY not set",
 )
 
+# Serialized once at import
+_FLOW_PAYLOAD = orjson.dumps({
+    "action": "execute",
+    "user_input": "The weather is sunny and 30 degrees",
+    "flow": {
+        "id": "integration-cond",
+        "name": "Conditional Integration",
+        "nodes": [
+            {
+                "id": "input-1",
+                "type": "input",
+                "position": {"x": 0, "y": 0},
+                "config": {"input_output": {"label": "Input", "data_type": "text"}},
+                "label": "Input",
+            },
+            {
+                "id": "cond-1",
+                "type": "conditional",
+                "position": {"x": 300, "y": 0},
+                "config": {
+                    "conditional": {
+                        "condition_expression": "The text describes warm weather (above 20 degrees)",
+                        "true_label": "Warm",
+                        "false_label": "Cold",
+                    }
+                },
+                "label": "Warm?",
+            },
+            {
+                "id": "output-true",
+                "type": "output",
+                "position": {"x": 600, "y": 0},
+                "config": {"input_output": {"label": "Warm Output", "data_type": "text"}},
+                "label": "Warm Output",
+            },
+            {
+                "id": "output-false",
+                "type": "output",
+                "position": {"x": 600, "y": 200},
+                "config": {"input_output": {"label": "Cold Output", "data_type": "text"}},
+                "label": "Cold Output",
+            },
+        ],
+        "edges": [
+            {"id": "e1", "source": "input-1", "target": "cond-1"},
+            {"id": "e2", "source": "cond-1", "source_handle": "true", "target": "output-true"},
+            {"id": "e3", "source": "cond-1", "source_handle": "false", "target": "output-false"},
+        ],
+        "metadata": {"version": "1.0.0"},
+    },
+}).decode()  # Text frame: the server reads the request with receive_text()
+
+
+async def _drain(ws, events):
+    """Decode frames into ``events`` until the run finishes or fails."""
+    async for msg in ws:
+        events.append(orjson.loads(msg))
+        if events[-1]["type"] in ("flow_complete", "error"):
+            return
+
 
 @pytest.mark.asyncio
 async def test_conditional_flow_integration():
     """Run a full conditional flow via WebSocket and verify branch routing."""
     import websockets
 
-    flow = {
-        "action": "execute",
-        "user_input": "The weather is sunny and 30 degrees",
-        "flow": {
-            "id": "integration-cond",
-            "name": "Conditional Integration",
-            "nodes": [
-                {
-                    "id": "input-1",
-                    "type": "input",
-                    "position": {"x": 0, "y": 0},
-                    "config": {"input_output": {"label": "Input", "data_type": "text"}},
-                    "label": "Input",
-                },
-                {
-                    "id": "cond-1",
-                    "type": "conditional",
-                    "position": {"x": 300, "y": 0},
-                    "config": {
-                        "conditional": {
-                            "condition_expression": "The text describes warm weather (above 20 degrees)",
-                            "true_label": "Warm",
-                            "false_label": "Cold",
-                        }
-                    },
-                    "label": "Warm?",
-                },
-                {
-                    "id": "output-true",
-                    "type": "output",
-                    "position": {"x": 600, "y": 0},
-                    "config": {"input_output": {"label": "Warm Output", "data_type": "text"}},
-                    "label": "Warm Output",
-                },
-                {
-                    "id": "output-false",
-                    "type": "output",
-                    "position": {"x": 600, "y": 200},
-                    "config": {"input_output": {"label": "Cold Output", "data_type": "text"}},
-                    "label": "Cold Output",
-                },
-            ],
-            "edges": [
-                {"id": "e1", "source": "input-1", "target": "cond-1"},
-                {"id": "e2", "source": "cond-1", "source_handle": "true", "target": "output-true"},
-                {"id": "e3", "source": "cond-1", "source_handle": "false", "target": "output-false"},
-            ],
-            "metadata": {"version": "1.0.0"},
-        },
-    }
-
     async with websockets.connect("ws://localhost:8000/ws/execution") as ws:
-        await ws.send(json.dumps(flow))
+        await ws.send(_FLOW_PAYLOAD)
 
         events = []
-        while True:
-            msg = await asyncio.wait_for(ws.recv(), timeout=30)
-            event = json.loads(msg)
-            events.append(event)
-            if event["type"] in ("flow_complete", "error"):
-                break
+        # One deadline for the whole run rather than a wait_for per frame
+        await asyncio.wait_for(_drain(ws, events), timeout=60)
 
     event_types = {(e["type"], e.get("node_id")): e for e in events}
 
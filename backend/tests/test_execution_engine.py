@@ -1,14 +1,27 @@
 """Tests for the execution engine — conditional branching and multi-agent chaining."""
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
-from app.services.execution_engine import ExecutionEngine
+from app.services.execution_engine import ExecutionEngine, _agent_call_key
+from app.services.llm_cache import LLMCache
+
+
+async def _events_by_key(engine, execution_graph, user_input):
+    """Run the graph and index its events by (type, node_id), first event wins."""
+    events = {}
+    async for event in engine.execute(execution_graph, user_input=user_input):
+        d = event.to_dict()
+        events.setdefault((d["type"], d["node_id"]), d)
+    return events
 
 
 @pytest.mark.asyncio
 async def test_conditional_passes_upstream_data():
     """The conditional node should pass through the upstream content, not 'true'/'false'."""
     # Always evaluates to "true" for testing — no OpenAI call
-    engine = ExecutionEngine(condition_evaluator=lambda upstream, condition: "true")
+    engine = ExecutionEngine(condition_evaluator=lambda upstream, condition: "true", llm_cache=LLMCache())
 
     # Simulate a compiled graph: Input -> Agent -> Conditional -> Output
     # The conditional evaluates to "true", but the output node should
@@ -33,15 +46,10 @@ async def test_conditional_passes_upstream_data():
         ],
     }
 
-    events = []
-    async for event in engine.execute(execution_graph, user_input=""):
-        events.append(event.to_dict())
+    events = await _events_by_key(engine, execution_graph, user_input="")
 
     # Find the output node's result
-    output_event = next(
-        (e for e in events if e["type"] == "node_output" and e["node_id"] == "output-1"),
-        None,
-    )
+    output_event = events.get(("node_output", "output-1"))
     assert output_event is not None, "Output node should have produced output"
     # The output should contain the agent's content, NOT "true"
     assert output_event["data"] != "true", "Conditional should not replace data with 'true'"
@@ -53,7 +61,7 @@ async def test_conditional_passes_upstream_data():
 async def test_conditional_skips_false_branch():
     """Nodes on the non-taken branch should be skipped entirely."""
     # Always evaluates to "true" for testing — no OpenAI call
-    engine = ExecutionEngine(condition_evaluator=lambda upstream, condition: "true")
+    engine = ExecutionEngine(condition_evaluator=lambda upstream, condition: "true", llm_cache=LLMCache())
 
     # Graph: Input -> Conditional -> (true) Output-True
     #                              -> (false) Output-False
@@ -78,34 +86,23 @@ async def test_conditional_skips_false_branch():
         ],
     }
 
-    events = []
-    async for event in engine.execute(execution_graph, user_input="hello"):
-        events.append(event.to_dict())
+    events = await _events_by_key(engine, execution_graph, user_input="hello")
 
     # Output-True should have executed
-    true_output = next(
-        (e for e in events if e["type"] == "node_output" and e["node_id"] == "output-true"),
-        None,
-    )
-    assert true_output is not None, "True-branch output should have executed"
+    assert ("node_output", "output-true") in events, "True-branch output should have executed"
 
     # Output-False should NOT have executed
-    false_output = next(
-        (e for e in events if e["type"] == "node_output" and e["node_id"] == "output-false"),
-        None,
-    )
-    assert false_output is None, "False-branch output should have been skipped"
+    assert ("node_output", "output-false") not in events, "False-branch output should have been skipped"
 
     # A node_skipped event should be emitted for the false branch
-    skipped = [e for e in events if e["type"] == "node_skipped"]
-    assert any(e["node_id"] == "output-false" for e in skipped), \
+    assert ("node_skipped", "output-false") in events, \
         "Should emit node_skipped for false-branch nodes"
 
 
 @pytest.mark.asyncio
 async def test_multi_agent_chaining():
     """Agent nodes should pass their output as context to downstream agents."""
-    engine = ExecutionEngine()
+    engine = ExecutionEngine(llm_cache=LLMCache())
 
     # Graph: Input -> Agent1 (Research) -> Agent2 (Summarize) -> Output
     # Agent1 and Agent2 are mocked as input nodes for testing without OpenAI
@@ -135,34 +132,421 @@ async def test_multi_agent_chaining():
         ],
     }
 
-    events = []
     # Pass empty user_input so mock agents use their "value" field instead
-    async for event in engine.execute(execution_graph, user_input=""):
-        events.append(event.to_dict())
+    events = await _events_by_key(engine, execution_graph, user_input="")
 
     # Verify Agent1 executed and produced output
-    agent1_output = next(
-        (e for e in events if e["type"] == "node_output" and e["node_id"] == "agent-1"),
-        None,
-    )
+    agent1_output = events.get(("node_output", "agent-1"))
     assert agent1_output is not None, "Agent1 should have produced output"
     assert "diagnostics" in agent1_output["data"].lower(), \
         "Agent1 should output research facts"
 
     # Verify Agent2 executed and produced output
-    agent2_output = next(
-        (e for e in events if e["type"] == "node_output" and e["node_id"] == "agent-2"),
-        None,
-    )
+    agent2_output = events.get(("node_output", "agent-2"))
     assert agent2_output is not None, "Agent2 should have produced output"
     assert "transforms" in agent2_output["data"].lower(), \
         "Agent2 should output summary"
 
     # Verify final output contains Agent2's result
-    final_output = next(
-        (e for e in events if e["type"] == "flow_complete"),
-        None,
-    )
+    final_output = events.get(("flow_complete", None))
     assert final_output is not None, "Flow should complete"
     assert "transforms" in final_output["data"].lower(), \
         "Final output should contain Agent2's summary"
+
+
+@pytest.mark.asyncio
+async def test_independent_branches_run_concurrently():
+    """Agents with no path between them should be awaited together."""
+    active = 0
+    peak = 0
+
+    class FakeAgent:
+        def __init__(self, reply):
+            self.name = f"Agent {reply}"
+            self.reply = reply
+
+        async def arun(self, prompt, stream=False):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            yield SimpleNamespace(event="RunContent", content=f"{self.reply}: {prompt}")
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+
+    # Graph: Input -> Agent-A -> Output
+    #              -> Agent-B ->
+    execution_graph = {
+        "flow_id": "test-fan-out",
+        "execution_order": ["input-1", "agent-a", "agent-b", "output-1"],
+        "compiled_nodes": {
+            "input-1": {"node_id": "input-1", "node_type": "input"},
+            "agent-a": {"node_id": "agent-a", "node_type": "agent", "agent": FakeAgent("A")},
+            "agent-b": {"node_id": "agent-b", "node_type": "agent", "agent": FakeAgent("B")},
+            "output-1": {"node_id": "output-1", "node_type": "output"},
+        },
+        "edges": [
+            {"id": "e1", "source": "input-1", "target": "agent-a"},
+            {"id": "e2", "source": "input-1", "target": "agent-b"},
+            {"id": "e3", "source": "agent-a", "target": "output-1"},
+            {"id": "e4", "source": "agent-b", "target": "output-1"},
+        ],
+    }
+
+    events = [event.to_dict() async for event in engine.execute(execution_graph, user_input="hi")]
+
+    assert peak == 2, "Both agents should have been in flight at the same time"
+
+    # Events are still emitted in execution order
+    outputs = [e["node_id"] for e in events if e["type"] == "node_output"]
+    assert outputs == ["input-1", "agent-a", "agent-b", "output-1"]
+
+    final = events[-1]
+    assert final["type"] == "flow_complete"
+    assert "A: hi" in final["data"] and "B: hi" in final["data"]
+
+
+@pytest.mark.asyncio
+async def test_failed_node_settles_its_siblings():
+    """When one node in a round fails, the others still get a terminal event."""
+
+    class FakeAgent:
+        def __init__(self, reply):
+            self.name = f"Sibling {reply}"
+            self.reply = reply
+
+        async def arun(self, prompt, stream=False):
+            await asyncio.sleep(0.01)
+            if self.reply == "boom":
+                raise RuntimeError("provider down")
+            yield SimpleNamespace(event="RunContent", content=f"{self.reply}: {prompt}")
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+
+    execution_graph = {
+        "flow_id": "test-fan-out-failure",
+        "execution_order": ["input-1", "agent-a", "agent-b", "output-1"],
+        "compiled_nodes": {
+            "input-1": {"node_id": "input-1", "node_type": "input"},
+            "agent-a": {"node_id": "agent-a", "node_type": "agent", "agent": FakeAgent("boom")},
+            "agent-b": {"node_id": "agent-b", "node_type": "agent", "agent": FakeAgent("ok")},
+            "output-1": {"node_id": "output-1", "node_type": "output"},
+        },
+        "edges": [
+            {"id": "e1", "source": "input-1", "target": "agent-a"},
+            {"id": "e2", "source": "input-1", "target": "agent-b"},
+            {"id": "e3", "source": "agent-a", "target": "output-1"},
+            {"id": "e4", "source": "agent-b", "target": "output-1"},
+        ],
+    }
+
+    events = await _events_by_key(engine, execution_graph, user_input="hi")
+
+    assert events[("error", "agent-a")]["message"] == "provider down"
+    assert ("node_complete", "agent-b") in events
+    assert ("node_start", "output-1") not in events
+    assert ("flow_complete", None) not in events
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_running_nodes():
+    """A consumer that stops mid-round cancels the round's provider calls."""
+    cancelled = []
+
+    class SlowAgent:
+        def __init__(self, reply):
+            self.name = f"Slow {reply}"
+            self.reply = reply
+
+        async def arun(self, prompt, stream=False):
+            yield SimpleNamespace(event="RunContent", content="first token")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(self.reply)
+                raise
+            yield SimpleNamespace(event="RunContent", content="never sent")
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+    execution_graph = {
+        "flow_id": "test-abandoned",
+        "execution_order": ["input-1", "agent-a", "agent-b"],
+        "compiled_nodes": {
+            "input-1": {"node_id": "input-1", "node_type": "input"},
+            "agent-a": {"node_id": "agent-a", "node_type": "agent", "agent": SlowAgent("A")},
+            "agent-b": {"node_id": "agent-b", "node_type": "agent", "agent": SlowAgent("B")},
+        },
+        "edges": [
+            {"id": "e1", "source": "input-1", "target": "agent-a"},
+            {"id": "e2", "source": "input-1", "target": "agent-b"},
+        ],
+    }
+
+    events = engine.execute(execution_graph, user_input="hi")
+    async for event in events:
+        if event.type == "node_output_delta":
+            break
+    await events.aclose()
+
+    assert sorted(cancelled) == ["A", "B"]
+    assert not engine._inflight
+
+
+@pytest.mark.asyncio
+async def test_identical_agent_calls_are_coalesced():
+    """Concurrent runs of the same agent on the same prompt share one call."""
+    calls = 0
+
+    class FakeAgent:
+        async def arun(self, prompt):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(content=prompt.upper())
+
+    agent = FakeAgent()
+    engine = ExecutionEngine(max_concurrency=1, llm_cache=LLMCache())
+
+    results = await asyncio.gather(
+        engine._run_agent(agent, "same prompt"),
+        engine._run_agent(agent, "same prompt"),
+        engine._run_agent(agent, "other prompt"),
+    )
+
+    assert results == ["SAME PROMPT", "SAME PROMPT", "OTHER PROMPT"]
+    assert calls == 2
+    assert not engine._inflight
+
+
+@pytest.mark.asyncio
+async def test_repeated_agent_calls_served_from_cache():
+    """A finished agent response is reused until the node asks to bust the cache."""
+    calls = 0
+
+    class FakeAgent:
+        async def arun(self, prompt):
+            nonlocal calls
+            calls += 1
+            return SimpleNamespace(content=f"reply #{calls}")
+
+    agent = FakeAgent()
+    engine = ExecutionEngine(llm_cache=LLMCache())
+
+    assert await engine._run_agent(agent, "prompt") == "reply #1"
+    assert await engine._run_agent(agent, "prompt") == "reply #1"
+    assert await engine._run_agent(agent, "prompt", cache_bust=True) == "reply #2"
+    assert await engine._run_agent(agent, "prompt") == "reply #2"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_agent_calls_are_not_cached():
+    """A run Agno returns with an error status raises and is retried next time."""
+    from agno.run.base import RunStatus
+
+    calls = 0
+
+    class FailingAgent:
+        async def arun(self, prompt):
+            nonlocal calls
+            calls += 1
+            return SimpleNamespace(content="Rate limit reached (429)", status=RunStatus.error)
+
+    agent = FailingAgent()
+    engine = ExecutionEngine(llm_cache=LLMCache())
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="429"):
+            await engine._run_agent(agent, "prompt")
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_or_unfinished_streams_are_not_cached():
+    """Streamed replies are cached only once the run reports completion."""
+    calls = 0
+
+    class StreamingAgent:
+        def __init__(self, finish):
+            self.name = f"Streamer {finish}"
+            self.finish = finish
+
+        async def arun(self, prompt, stream=False):
+            nonlocal calls
+            calls += 1
+            yield SimpleNamespace(event="RunContent", content="partial")
+            if self.finish:
+                yield SimpleNamespace(event="RunCompleted", content="partial")
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+    unfinished, finished = StreamingAgent(False), StreamingAgent(True)
+
+    for agent in (unfinished, unfinished, finished, finished):
+        assert await engine._run_agent(agent, "prompt", on_delta=lambda _: None) == "partial"
+    assert calls == 3
+
+
+def test_call_key_covers_model_and_tool_settings():
+    """Agents differing only in sampling params or tool options don't share cache entries."""
+    from agno.agent import Agent
+    from agno.models.openai import OpenAIChat
+    from agno.tools.duckduckgo import DuckDuckGoTools
+
+    def key(temperature=None, timelimit=None):
+        agent = Agent(
+            name="Searcher",
+            model=OpenAIChat(id="gpt-4o-mini", temperature=temperature),
+            tools=[DuckDuckGoTools(timelimit=timelimit)],
+        )
+        return _agent_call_key(agent, "prompt")
+
+    assert key() == key()
+    assert key(temperature=0.2) != key()
+    assert key(timelimit="d") != key()
+
+
+@pytest.mark.asyncio
+async def test_kb_sources_load_independently():
+    """One failing knowledge-base source doesn't stop the others from loading."""
+    loaded = []
+
+    class FakeKnowledge:
+        async def add_content_async(self, path=None, url=None):
+            if url == "https://broken.example.com":
+                raise ConnectionError("unreachable")
+            loaded.append(path or url)
+
+    knowledge = FakeKnowledge()
+    limit = asyncio.Semaphore(2)
+    sources = ["/uploads/a.pdf", "https://broken.example.com", "https://python.org"]
+
+    results = await asyncio.gather(
+        *(ExecutionEngine._load_kb_source(knowledge, source, limit) for source in sources)
+    )
+
+    assert results == [True, False, True]
+    assert sorted(loaded) == ["/uploads/a.pdf", "https://python.org"]
+
+
+@pytest.mark.asyncio
+async def test_agent_output_is_streamed_as_deltas():
+    """Agent nodes emit node_output_delta events before their full node_output."""
+
+    class StreamingAgent:
+        name = "Streamer"
+
+        async def arun(self, prompt, stream=False):
+            assert stream, "Agent nodes should request a streamed response"
+            for token in ["Hello", ", ", "world"]:
+                await asyncio.sleep(0)
+                yield SimpleNamespace(event="RunContent", content=token)
+            yield SimpleNamespace(event="RunCompleted", content="Hello, world")
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+    execution_graph = {
+        "flow_id": "test-stream",
+        "execution_order": ["input-1", "agent-1"],
+        "compiled_nodes": {
+            "input-1": {"node_id": "input-1", "node_type": "input"},
+            "agent-1": {"node_id": "agent-1", "node_type": "agent", "agent": StreamingAgent()},
+        },
+        "edges": [{"id": "e1", "source": "input-1", "target": "agent-1"}],
+    }
+
+    events = [event.to_dict() async for event in engine.execute(execution_graph, user_input="hi")]
+    agent_events = [(e["type"], e["data"]) for e in events if e["node_id"] == "agent-1"]
+
+    assert agent_events == [
+        ("node_start", None),
+        ("node_output_delta", "Hello"),
+        ("node_output_delta", ", "),
+        ("node_output_delta", "world"),
+        ("node_output", "Hello, world"),
+        ("node_complete", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_error_after_partial_deltas():
+    """A mid-stream RunError ends the node with an error event and no node_output."""
+
+    class FlakyAgent:
+        name = "Flaky"
+
+        async def arun(self, prompt, stream=False):
+            yield SimpleNamespace(event="RunContent", content="Hal")
+            yield SimpleNamespace(event="RunError", content="connection reset")
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+    execution_graph = {
+        "flow_id": "test-stream-error",
+        "execution_order": ["input-1", "agent-1"],
+        "compiled_nodes": {
+            "input-1": {"node_id": "input-1", "node_type": "input"},
+            "agent-1": {"node_id": "agent-1", "node_type": "agent", "agent": FlakyAgent()},
+        },
+        "edges": [{"id": "e1", "source": "input-1", "target": "agent-1"}],
+    }
+
+    events = [event.to_dict() async for event in engine.execute(execution_graph, user_input="hi")]
+    agent_events = [(e["type"], e["data"]) for e in events if e["node_id"] == "agent-1"]
+
+    assert agent_events == [
+        ("node_start", None),
+        ("node_output_delta", "Hal"),
+        ("error", None),
+    ]
+    assert events[-1]["message"] == "connection reset"
+
+
+def test_prepared_plan_reused_for_same_graph():
+    """Scheduling indexes are built once per graph structure, not per run."""
+    engine = ExecutionEngine(llm_cache=LLMCache())
+    graph = {
+        "flow_id": "test-plan",
+        "execution_order": ["input-1", "output-1"],
+        "compiled_nodes": {},
+        "edges": [{"id": "e1", "source": "input-1", "target": "output-1"}],
+    }
+
+    plan = engine._prepare(graph)
+
+    assert engine._prepare(graph) is plan
+    # Recompiles of the same flow share execution_order/edges with fresh nodes
+    assert engine._prepare({**graph, "compiled_nodes": {}}) is plan
+    assert engine._prepare({**graph, "edges": list(graph["edges"])}) is not plan
+    assert plan.roots == ("input-1",)
+    assert plan.children["input-1"] == ["output-1"]
+    assert plan.indegree == {"input-1": 0, "output-1": 1}
+
+
+def test_helper_agents_built_per_call():
+    """Evaluator and RAG agents aren't shared between runs (they carry session state)."""
+    first = ExecutionEngine._build_evaluator("The text is positive")
+
+    assert ExecutionEngine._build_evaluator("The text is positive") is not first
+    assert "Condition: The text is positive" in first.instructions
+    assert ExecutionEngine._build_rag_agent(None) is not ExecutionEngine._build_rag_agent(None)
+
+
+@pytest.mark.asyncio
+async def test_knowledge_loaded_once_off_the_event_loop():
+    """A knowledge object is loaded in a worker thread, once per object."""
+    import threading
+
+    loads = []
+
+    class FakeKnowledge:
+        def load(self, recreate=False):
+            loads.append(threading.current_thread() is threading.main_thread())
+
+    engine = ExecutionEngine(llm_cache=LLMCache())
+    knowledge = FakeKnowledge()
+
+    await engine._ensure_knowledge_loaded("kb-1", knowledge)
+    await engine._ensure_knowledge_loaded("kb-1", knowledge)
+    assert loads == [False]
+
+    del knowledge
+    assert not engine._loaded_knowledge
@@ -2,14 +2,10 @@
 Test suite for export API endpoints.
 """
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
 
-
-@pytest.fixture
-def test_flow_id():
+@pytest.fixture(scope="module")
+def test_flow_id(client):
     """Create a test flow and return its ID."""
     flow = {
         "id": "test-export-flow",
@@ -52,7 +48,7 @@ def test_flow_id():
     client.delete("/api/flows/test-export-flow")
 
 
-def test_export_python_endpoint(test_flow_id):
+def test_export_python_endpoint(client, test_flow_id):
     """Test Python export endpoint."""
     response = client.get(f"/api/flows/{test_flow_id}/export/python")
 
@@ -63,7 +59,7 @@ def test_export_python_endpoint(test_flow_id):
     assert "gpt-4o" in response.text
 
 
-def test_export_endpoint_exists():
+def test_export_endpoint_exists(client):
     """Test that export endpoint is registered and callable."""
     # Without Supabase credentials, we expect a 500 error from Supabase client init
     # But this proves the endpoint exists and is callable (not 404 route not found)
@@ -28,13 +28,17 @@ def test_validate_binary_file_fails():
 
 def test_validate_large_file_warns():
     """Files over 10MB should get size warning."""
-    content = b"x" * (11 * 1024 * 1024)  # 11MB
-    validator = FileValidator(content, filename="large.txt")
+    # Stream 11MB through one reused 1MB chunk instead of holding it all
+    chunk = b"x" * (1024 * 1024)
+    validator = FileValidator(b"", filename="large.txt")
+    for _ in range(11):
+        validator.feed(chunk)
 
     result = validator.validate()
 
     assert result["valid"] is True
-    assert any("large" in w.lower() for w in result["warnings"])
+    assert FileValidator.SIZE_LARGE in result["warning_codes"]
+    assert len(result["warnings"]) == 1
 
 
 def test_validate_empty_file_fails():
@@ -46,3 +50,25 @@ def test_validate_empty_file_fails():
 
     assert result["valid"] is False
     assert "empty" in result["error"].lower()
+
+
+def test_validate_pdf_checks_magic_number():
+    """PDFs are accepted on their header alone; mismatched content is rejected."""
+    valid = FileValidator(b"%PDF-1.7\n\x00\x01\x02 binary body", filename="doc.pdf")
+    assert valid.validate()["valid"] is True
+
+    fake = FileValidator(b"just some text", filename="doc.pdf")
+    result = fake.validate()
+    assert result["valid"] is False
+    assert ".pdf" in result["error"]
+
+
+def test_validate_streamed_chunks_match_whole_buffer():
+    """Feeding chunks gives the same verdict as passing the whole buffer."""
+    content = b"line one\nline two\n" * 1000
+    validator = FileValidator(b"", filename="notes.txt")
+    for i in range(0, len(content), 4096):
+        validator.feed(content[i:i + 4096])
+
+    assert validator.size == len(content)
+    assert validator.validate() == FileValidator(content, filename="notes.txt").validate()
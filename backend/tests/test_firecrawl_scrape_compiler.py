@@ -2,12 +2,11 @@
 
 import pytest
 from app.models.flow import FlowNode, NodeConfig, FirecrawlScrapeConfig
+from app.compiler.nodes.firecrawl_scrape_compiler import FirecrawlScrapeNodeCompiler
 
 
 def test_firecrawl_scrape_compiler_basic():
     """Test basic Firecrawl Scrape compilation."""
-    from app.compiler.nodes.firecrawl_scrape_compiler import FirecrawlScrapeNodeCompiler
-
     node = FlowNode(
         id="test-firecrawl",
         type="firecrawl_scrape",
@@ -33,8 +32,6 @@ def test_firecrawl_scrape_compiler_basic():
 
 def test_firecrawl_scrape_compiler_multiple_formats():
     """Test Firecrawl with multiple output formats."""
-    from app.compiler.nodes.firecrawl_scrape_compiler import FirecrawlScrapeNodeCompiler
-
     node = FlowNode(
         id="test-multi",
         type="firecrawl_scrape",
@@ -59,7 +56,5 @@ def test_firecrawl_scrape_compiler_multiple_formats():
 
 def test_firecrawl_scrape_compiler_node_type():
     """Test compiler reports correct node type."""
-    from app.compiler.nodes.firecrawl_scrape_compiler import FirecrawlScrapeNodeCompiler
-
     compiler = FirecrawlScrapeNodeCompiler()
     assert compiler.node_type == "firecrawl_scrape"
@@ -18,8 +18,12 @@ from app.models.flow import (
     AgentProvider,
     InputOutputConfig,
     ConditionalConfig,
+    KnowledgeBaseConfig,
 )
 from app.compiler.flow_compiler import FlowCompiler
+from app.compiler.nodes.base import BaseNodeCompiler
+from app.compiler.nodes.input_compiler import InputNodeCompiler
+from app.compiler.nodes.knowledge_base_compiler import KnowledgeBaseNodeCompiler
 
 
 def _make_input_node(node_id: str = "node_input") -> FlowNode:
@@ -179,6 +183,122 @@ class TestFlowCompilation:
         with pytest.raises(ValueError, match="[Cc]ycle"):
             compiler.compile(flow)
 
+    def test_compile_reuses_result_for_unchanged_flow(self):
+        """Recompiling identical content reuses the validated structure only."""
+        def make_flow(label: str) -> FlowDefinition:
+            node = _make_input_node()
+            node.label = label
+            return FlowDefinition(
+                id="test-flow-cache",
+                name="Cached Flow",
+                nodes=[node],
+                edges=[],
+                metadata=FlowMetadata(),
+            )
+
+        compiler = FlowCompiler()
+        first = compiler.compile(make_flow("Input"))
+        second = compiler.compile(make_flow("Input"))
+
+        assert second is not first
+        assert second["execution_order"] is first["execution_order"]
+        assert compiler.compile(make_flow("Renamed"))["execution_order"] is not first["execution_order"]
+
+    def test_each_compile_builds_fresh_agents(self):
+        """Agents carry per-run state, so repeat compiles never share them."""
+        flow = FlowDefinition(
+            id="test-flow-agents",
+            name="Agent Flow",
+            nodes=[_make_input_node(), _make_agent_node()],
+            edges=[FlowEdge(id="e1", source="node_input", target="node_agent")],
+            metadata=FlowMetadata(),
+        )
+
+        compiler = FlowCompiler()
+        first = compiler.compile(flow)["compiled_nodes"]["node_agent"]["agent"]
+        second = compiler.compile(flow)["compiled_nodes"]["node_agent"]["agent"]
+
+        assert first is not second
+
+    def test_knowledge_error_not_pinned(self, monkeypatch):
+        """A transient PgVector failure is retried on the next compile."""
+        outcomes = [RuntimeError("database unreachable"), "knowledge"]
+
+        def build(kb_cfg):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(KnowledgeBaseNodeCompiler, "_build_pgvector_knowledge", staticmethod(build))
+        flow = FlowDefinition(
+            id="test-flow-kb-retry",
+            name="KB Flow",
+            nodes=[
+                FlowNode(
+                    id="node_kb_retry",
+                    type=NodeType.KNOWLEDGE_BASE,
+                    config=NodeConfig(
+                        knowledge_base=KnowledgeBaseConfig(sources=["/uploads/kb-retry.txt"])
+                    ),
+                )
+            ],
+            edges=[],
+            metadata=FlowMetadata(),
+        )
+
+        compiler = FlowCompiler()
+        failed = compiler.compile(flow)["compiled_nodes"]["node_kb_retry"]
+        retried = compiler.compile(flow)["compiled_nodes"]["node_kb_retry"]
+
+        assert failed["knowledge_error"] == "database unreachable"
+        assert retried["knowledge"] == "knowledge"
+        assert "knowledge_error" not in retried
+
+    def test_knowledge_cache_follows_database_url(self, monkeypatch):
+        """Changing DATABASE_URL in-process gives PgVector nodes a new cache key."""
+        node = FlowNode(
+            id="node_kb_url",
+            type=NodeType.KNOWLEDGE_BASE,
+            config=NodeConfig(knowledge_base=KnowledgeBaseConfig(sources=["/uploads/kb-url.txt"])),
+        )
+        compiler = KnowledgeBaseNodeCompiler()
+
+        monkeypatch.setenv("DATABASE_URL", "postgresql://db-one/coconut")
+        first = compiler.cache_key(node)
+        monkeypatch.setenv("DATABASE_URL", "postgresql://db-two/coconut")
+
+        assert compiler.cache_key(node) != first
+
+    def test_validate_hook_errors_reject_flow(self):
+        """A compiler that overrides validate() has its errors reported."""
+        class StrictInputCompiler(InputNodeCompiler):
+            def validate(self, node):
+                return [f"{node.id}: label required"] if node.label == "Input" else []
+
+        assert StrictInputCompiler.has_validate
+        assert not InputNodeCompiler.has_validate
+
+        flow = FlowDefinition(
+            id="test-flow-validate",
+            name="Validated Flow",
+            nodes=[_make_input_node()],
+            edges=[],
+            metadata=FlowMetadata(),
+        )
+
+        compiler = FlowCompiler()
+        compiler.register_compiler("input", StrictInputCompiler())
+        with pytest.raises(ValueError, match="label required"):
+            compiler.compile(flow)
+
+    def test_compiler_without_node_type_rejected(self):
+        """Node compilers must declare node_type as a class attribute."""
+        with pytest.raises(TypeError, match="node_type"):
+            class UntypedCompiler(BaseNodeCompiler):
+                def compile(self, node, context=None):
+                    return {}
+
 
 class TestFlowDefinitionParsing:
     """Test that FlowDefinition parses correctly from JSON-like dicts."""
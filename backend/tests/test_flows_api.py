@@ -3,12 +3,8 @@ Test suite for flows CRUD API with Supabase persistence.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
-
-def test_create_flow():
+def test_create_flow(client):
     """Test creating a new flow"""
     flow = {
         "id": "test-flow-1",
@@ -31,13 +27,13 @@ def test_create_flow():
     assert response.json()["id"] == "test-flow-1"
     assert response.json()["name"] == "Test Flow"
 
-def test_list_flows():
+def test_list_flows(client):
     """Test listing all flows"""
     response = client.get("/api/flows/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
-def test_get_flow():
+def test_get_flow(client):
     """Test getting a specific flow"""
     # First create a flow
     flow = {
@@ -54,7 +50,7 @@ def test_get_flow():
     assert response.status_code == 200
     assert response.json()["id"] == "test-flow-2"
 
-def test_update_flow():
+def test_update_flow(client):
     """Test updating an existing flow"""
     # Create
     flow = {
@@ -72,7 +68,7 @@ def test_update_flow():
     assert response.status_code == 200
     assert response.json()["name"] == "Updated Name"
 
-def test_delete_flow():
+def test_delete_flow(client):
     """Test deleting a flow"""
     # Create
     flow = {
@@ -91,3 +87,115 @@ def test_delete_flow():
     # Verify deleted
     response = client.get("/api/flows/test-flow-4")
     assert response.status_code == 404
+
+def test_compile_agent_flow(client, fake_supabase):
+    """Compiled agents must survive JSON encoding of the endpoint response"""
+    fake_supabase.tables["flows"] = [{
+        "id": "agent-flow",
+        "name": "Agent Flow",
+        "description": "",
+        "nodes": [
+            {"id": "in", "type": "input", "position": {"x": 0, "y": 0},
+             "config": {"input_output": {"label": "Question", "data_type": "text"}}},
+            {"id": "agent", "type": "agent", "position": {"x": 200, "y": 0},
+             "config": {"agent": {"name": "Helper", "provider": "openai", "model": "gpt-4o-mini",
+                                  "instructions": ["Answer briefly."]}}},
+        ],
+        "edges": [{"id": "e1", "source": "in", "target": "agent"}],
+        "metadata": {},
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+    }]
+
+    response = client.post("/api/flows/agent-flow/compile")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "compiled"
+    assert body["execution_graph"]["execution_order"] == ["in", "agent"]
+
+
+OWNER = "6f1c2d3e-4a5b-4c6d-8e7f-901234567890"
+
+
+def _owned_row(flow_id, user_id):
+    return {
+        "id": flow_id, "name": "Owned", "description": "", "nodes": [], "edges": [],
+        "metadata": {}, "user_id": user_id,
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
+def test_update_respects_owner(client, fake_supabase):
+    """Owners and unowned rows may be edited; another user's row may not"""
+    fake_supabase.tables["flows"] = [
+        _owned_row("mine", OWNER), _owned_row("blank", ""), _owned_row("nobody", None),
+    ]
+    body = {"id": "x", "name": "Renamed", "nodes": [], "edges": [], "metadata": {}, "user_id": OWNER}
+
+    other = "0a0b0c0d-0000-4000-8000-000000000000"
+    response = client.put("/api/flows/mine", params={"user_id": other}, json=body)
+    assert response.status_code == 403
+
+    for flow_id in ("mine", "blank", "nobody"):
+        response = client.put(f"/api/flows/{flow_id}", params={"user_id": OWNER}, json=body)
+        assert response.status_code == 200
+
+
+def test_owner_filter_rejects_injection(client, fake_supabase):
+    """A user_id that isn't a UUID can't widen the ownership filter"""
+    fake_supabase.tables["flows"] = [_owned_row("theirs", OWNER)]
+    body = {"id": "x", "name": "Hijacked", "nodes": [], "edges": [], "metadata": {}}
+
+    response = client.put(
+        "/api/flows/theirs", params={"user_id": 'x",user_id.neq."x'}, json=body,
+    )
+    assert response.status_code == 422
+    response = client.delete("/api/flows/theirs", params={"user_id": 'x",id.eq."theirs'})
+    assert response.status_code == 422
+    assert fake_supabase.tables["flows"][0]["name"] == "Owned"
+
+
+def test_get_flow_not_modified_on_matching_etag(client, fake_supabase):
+    fake_supabase.tables["flows"] = [_owned_row("etag-flow", None)]
+    first = client.get("/api/flows/etag-flow")
+    etag = first.headers["ETag"]
+
+    response = client.get("/api/flows/etag-flow", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_get_flow_new_etag_after_update(client, fake_supabase):
+    fake_supabase.tables["flows"] = [_owned_row("etag-flow", None)]
+    etag = client.get("/api/flows/etag-flow").headers["ETag"]
+
+    body = {"id": "etag-flow", "name": "Changed", "nodes": [], "edges": [], "metadata": {}}
+    assert client.put("/api/flows/etag-flow", json=body).status_code == 200
+
+    response = client.get("/api/flows/etag-flow", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Changed"
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize("header", ["W/{etag}", "*", '"other", {etag}', '"a",W/{etag} , "b"'])
+def test_if_none_match_forms(client, fake_supabase, header):
+    """Weak tags, the wildcard and comma-separated lists all match"""
+    fake_supabase.tables["flows"] = [_owned_row("etag-flow", None)]
+    etag = client.get("/api/flows/etag-flow").headers["ETag"]
+
+    response = client.get("/api/flows/etag-flow", headers={"If-None-Match": header.format(etag=etag)})
+    assert response.status_code == 304
+
+
+def test_list_flows_etag(client, fake_supabase):
+    fake_supabase.tables["flows"] = [_owned_row("etag-flow", None)]
+    etag = client.get("/api/flows/").headers["ETag"]
+
+    assert client.get("/api/flows/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/flows/", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    client.delete("/api/flows/etag-flow")
+    response = client.get("/api/flows/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == []
@@ -2,12 +2,11 @@
 
 import pytest
 from app.models.flow import FlowNode, NodeConfig, HuggingFaceInferenceConfig
+from app.compiler.nodes.huggingface_inference_compiler import HuggingFaceInferenceNodeCompiler
 
 
 def test_huggingface_inference_compiler_basic():
     """Test basic Hugging Face Inference compilation."""
-    from app.compiler.nodes.huggingface_inference_compiler import HuggingFaceInferenceNodeCompiler
-
     node = FlowNode(
         id="test-hf",
         type="huggingface_inference",
@@ -35,8 +34,6 @@ def test_huggingface_inference_compiler_basic():
 
 def test_huggingface_inference_compiler_embeddings():
     """Test HF Inference with embeddings task."""
-    from app.compiler.nodes.huggingface_inference_compiler import HuggingFaceInferenceNodeCompiler
-
     node = FlowNode(
         id="test-embeddings",
         type="huggingface_inference",
@@ -61,8 +58,6 @@ def test_huggingface_inference_compiler_embeddings():
 
 def test_huggingface_inference_compiler_with_credential():
     """Test HF Inference with credential ID."""
-    from app.compiler.nodes.huggingface_inference_compiler import HuggingFaceInferenceNodeCompiler
-
     node = FlowNode(
         id="test-cred",
         type="huggingface_inference",
@@ -87,16 +82,12 @@ def test_huggingface_inference_compiler_with_credential():
 
 def test_huggingface_inference_compiler_node_type():
     """Test compiler reports correct node type."""
-    from app.compiler.nodes.huggingface_inference_compiler import HuggingFaceInferenceNodeCompiler
-
     compiler = HuggingFaceInferenceNodeCompiler()
     assert compiler.node_type == "huggingface_inference"
 
 
 def test_huggingface_inference_compiler_missing_config():
     """Test compiler raises error when config is missing."""
-    from app.compiler.nodes.huggingface_inference_compiler import HuggingFaceInferenceNodeCompiler
-
     node = FlowNode(
         id="test-missing",
         type="huggingface_inference",
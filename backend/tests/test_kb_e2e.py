@@ -6,6 +6,7 @@ from app.services.execution_engine import ExecutionEngine
 from app.models.flow import FlowDefinition
 
 
+@pytest.mark.external
 @pytest.mark.skipif(
     not os.environ.get("DATABASE_URL") or not os.environ.get("OPENAI_API_KEY"),
     reason="Requires DATABASE_URL and OPENAI_API_KEY for E2E testing"
@@ -4,6 +4,16 @@ import pytest
 from app.services.source_detector import SourceType, SourceDetector
 
 
+@pytest.fixture(scope="module")
+def pg_engine():
+    """One SQLAlchemy engine (and connection pool) shared by the PgVector tests."""
+    from sqlalchemy import create_engine
+
+    engine = create_engine(os.environ["DATABASE_URL"], pool_size=4)
+    yield engine
+    engine.dispose()
+
+
 def test_source_type_detection():
     """Verify source type detection logic."""
     # File paths
@@ -16,21 +26,19 @@ def test_source_type_detection():
     assert SourceDetector.detect("https://youtube.com/watch?v=abc") == SourceType.YOUTUBE
 
 
+@pytest.mark.external
 @pytest.mark.skipif(
     not os.environ.get("DATABASE_URL") or not os.environ.get("OPENAI_API_KEY"),
     reason="Requires DATABASE_URL and OPENAI_API_KEY for integration testing"
 )
 @pytest.mark.asyncio
-async def test_knowledge_base_loads_file_source():
+async def test_knowledge_base_loads_file_source(pg_engine):
     """Test that Knowledge Base loads file sources via add_content_async."""
     from agno.knowledge import Knowledge
     from agno.vectordb.pgvector import PgVector
 
     # Create Knowledge instance
-    vector_db = PgVector(
-        table_name="kb_test",
-        db_url=os.environ["DATABASE_URL"]
-    )
+    vector_db = PgVector(table_name="kb_test", db_engine=pg_engine)
     knowledge = Knowledge(name="kb_test", vector_db=vector_db)
 
     # Create a test file
@@ -67,21 +75,19 @@ async def test_knowledge_base_loads_file_source():
             os.remove(test_file)
 
 
+@pytest.mark.external
 @pytest.mark.skipif(
     not os.environ.get("DATABASE_URL") or not os.environ.get("OPENAI_API_KEY"),
     reason="Requires DATABASE_URL and OPENAI_API_KEY for integration testing"
 )
 @pytest.mark.asyncio
-async def test_knowledge_base_loads_youtube_source():
+async def test_knowledge_base_loads_youtube_source(pg_engine):
     """Test that Knowledge Base can load YouTube URLs."""
     from agno.knowledge import Knowledge
     from agno.vectordb.pgvector import PgVector
 
     # Create Knowledge instance
-    vector_db = PgVector(
-        table_name="kb_test_yt",
-        db_url=os.environ["DATABASE_URL"]
-    )
+    vector_db = PgVector(table_name="kb_test_yt", db_engine=pg_engine)
     knowledge = Knowledge(name="kb_test_yt", vector_db=vector_db)
 
     # Use a short, well-known YouTube video with captions
@@ -95,21 +101,19 @@ async def test_knowledge_base_loads_youtube_source():
     assert True
 
 
+@pytest.mark.external
 @pytest.mark.skipif(
     not os.environ.get("DATABASE_URL") or not os.environ.get("OPENAI_API_KEY"),
     reason="Requires DATABASE_URL and OPENAI_API_KEY for integration testing"
 )
 @pytest.mark.asyncio
-async def test_knowledge_base_loads_website_source():
+async def test_knowledge_base_loads_website_source(pg_engine):
     """Test that Knowledge Base can load website URLs."""
     from agno.knowledge import Knowledge
     from agno.vectordb.pgvector import PgVector
 
     # Create Knowledge instance
-    vector_db = PgVector(
-        table_name="kb_test_web",
-        db_url=os.environ["DATABASE_URL"]
-    )
+    vector_db = PgVector(table_name="kb_test_web", db_engine=pg_engine)
     knowledge = Knowledge(name="kb_test_web", vector_db=vector_db)
 
     # Use a stable, simple website (Python.org about page)
@@ -5,11 +5,10 @@ from app.services.execution_engine import ExecutionEngine
 
 
 @pytest.mark.asyncio
-async def test_knowledge_base_graceful_degradation_without_db():
+async def test_knowledge_base_graceful_degradation_without_db(monkeypatch):
     """KB should return error message when DATABASE_URL is not set."""
-    # Temporarily clear DATABASE_URL to test graceful degradation
-    original_db_url = os.environ.get("DATABASE_URL")
-    os.environ["DATABASE_URL"] = ""
+    # Clear DATABASE_URL for this test only (restored even if it fails)
+    monkeypatch.setenv("DATABASE_URL", "")
 
     engine = ExecutionEngine()
 
@@ -33,37 +32,29 @@ async def test_knowledge_base_graceful_degradation_without_db():
         ],
     }
 
-    events = []
+    # Keep only the two events the test inspects; the run is still drained
+    # to the end so the engine finishes cleanly
+    kb_output = flow_complete = None
     async for event in engine.execute(execution_graph, user_input="What is AI?"):
-        events.append(event.to_dict())
-
-    # Restore original DATABASE_URL
-    if original_db_url:
-        os.environ["DATABASE_URL"] = original_db_url
-    else:
-        os.environ.pop("DATABASE_URL", None)
+        if event.type == "node_output" and event.node_id == "kb-1" and kb_output is None:
+            kb_output = event.data
+        elif event.type == "flow_complete":
+            flow_complete = event
 
     # Verify KB node executed (didn't crash)
-    kb_output = next(
-        (e for e in events if e["type"] == "node_output" and e["node_id"] == "kb-1"),
-        None,
-    )
     assert kb_output is not None, "KB node should have produced output"
 
     # Verify it returned an error message, not a crash
-    assert "Knowledge Base unavailable" in kb_output["data"], \
-        f"Should return graceful error message, got: {kb_output['data']}"
-    assert "DATABASE_URL not set" in kb_output["data"], \
+    assert "Knowledge Base unavailable" in kb_output, \
+        f"Should return graceful error message, got: {kb_output}"
+    assert "DATABASE_URL not set" in kb_output, \
         "Error message should explain the issue"
 
     # Verify flow completed
-    flow_complete = next(
-        (e for e in events if e["type"] == "flow_complete"),
-        None,
-    )
     assert flow_complete is not None, "Flow should complete despite KB unavailability"
 
 
+@pytest.mark.external
 @pytest.mark.skipif(
     not os.environ.get("DATABASE_URL"),
     reason="Requires DATABASE_URL to be set for integration testing"
@@ -2,98 +2,88 @@
 
 import pytest
 from app.models.flow import FlowNode, NodeConfig, MCPServerConfig
+from app.compiler.nodes.mcp_server_compiler import MCPServerNodeCompiler
 
 
-def test_mcp_server_compiler_basic():
-    """Test basic MCP Server compilation."""
-    from app.compiler.nodes.mcp_server_compiler import MCPServerNodeCompiler
+@pytest.fixture(scope="module")
+def compiler():
+    return MCPServerNodeCompiler()
 
-    node = FlowNode(
-        id="test-mcp",
-        type="mcp_server",
-        config=NodeConfig(
-            mcp_server=MCPServerConfig(
-                server_name="filesystem",
-                server_url="/usr/local/bin/mcp-server-filesystem",
-                server_type="stdio"
-            )
-        ),
-        position={"x": 0, "y": 0}
-    )
-
-    compiler = MCPServerNodeCompiler()
-    result = compiler.compile(node, context={})
 
-    assert result["node_type"] == "mcp_server"
-    assert result["node_id"] == "test-mcp"
-    assert result["server_name"] == "filesystem"
-    assert result["server_url"] == "/usr/local/bin/mcp-server-filesystem"
-    assert result["server_type"] == "stdio"
-
-
-def test_mcp_server_compiler_with_instructions():
-    """Test MCP Server with custom instructions."""
-    from app.compiler.nodes.mcp_server_compiler import MCPServerNodeCompiler
-
-    node = FlowNode(
-        id="test-mcp-instructions",
+def _mcp_node(node_id, **config):
+    return FlowNode(
+        id=node_id,
         type="mcp_server",
-        config=NodeConfig(
-            mcp_server=MCPServerConfig(
-                server_name="github",
-                server_url="https://api.github.com/mcp",
-                server_type="http",
-                instructions="Search GitHub repositories and issues",
-                credential_id="cred-456"
-            )
-        ),
+        config=NodeConfig(mcp_server=MCPServerConfig(**config)),
         position={"x": 0, "y": 0}
     )
 
-    compiler = MCPServerNodeCompiler()
-    result = compiler.compile(node, context={})
-
-    assert result["server_type"] == "http"
-    assert result["instructions"] == "Search GitHub repositories and issues"
-    assert result["credential_id"] == "cred-456"
 
-
-def test_mcp_server_compiler_sse_type():
-    """Test MCP Server with SSE server type."""
-    from app.compiler.nodes.mcp_server_compiler import MCPServerNodeCompiler
-
-    node = FlowNode(
-        id="test-mcp-sse",
-        type="mcp_server",
-        config=NodeConfig(
-            mcp_server=MCPServerConfig(
-                server_name="realtime-server",
-                server_url="https://sse.example.com/events",
-                server_type="sse"
-            )
+@pytest.mark.parametrize(
+    "node_id,config,expected",
+    [
+        pytest.param(
+            "test-mcp",
+            {
+                "server_name": "filesystem",
+                "server_url": "/usr/local/bin/mcp-server-filesystem",
+                "server_type": "stdio",
+            },
+            {
+                "node_type": "mcp_server",
+                "node_id": "test-mcp",
+                "server_name": "filesystem",
+                "server_url": "/usr/local/bin/mcp-server-filesystem",
+                "server_type": "stdio",
+            },
+            id="basic",
         ),
-        position={"x": 0, "y": 0}
-    )
-
-    compiler = MCPServerNodeCompiler()
-    result = compiler.compile(node, context={})
+        pytest.param(
+            "test-mcp-instructions",
+            {
+                "server_name": "github",
+                "server_url": "https://api.github.com/mcp",
+                "server_type": "http",
+                "instructions": "Search GitHub repositories and issues",
+                "credential_id": "cred-456",
+            },
+            {
+                "server_type": "http",
+                "instructions": "Search GitHub repositories and issues",
+                "credential_id": "cred-456",
+            },
+            id="with-instructions",
+        ),
+        pytest.param(
+            "test-mcp-sse",
+            {
+                "server_name": "realtime-server",
+                "server_url": "https://sse.example.com/events",
+                "server_type": "sse",
+            },
+            {
+                "server_type": "sse",
+                "server_url": "https://sse.example.com/events",
+            },
+            id="sse-type",
+        ),
+    ],
+)
+def test_mcp_server_compiler(compiler, node_id, config, expected):
+    """Test MCP Server compilation for each server type."""
+    result = compiler.compile(_mcp_node(node_id, **config), context={})
 
-    assert result["server_type"] == "sse"
-    assert result["server_url"] == "https://sse.example.com/events"
+    for key, value in expected.items():
+        assert result[key] == value
 
 
-def test_mcp_server_compiler_node_type():
+def test_mcp_server_compiler_node_type(compiler):
     """Test compiler reports correct node type."""
-    from app.compiler.nodes.mcp_server_compiler import MCPServerNodeCompiler
-
-    compiler = MCPServerNodeCompiler()
     assert compiler.node_type == "mcp_server"
 
 
-def test_mcp_server_compiler_missing_config():
+def test_mcp_server_compiler_missing_config(compiler):
     """Test compiler raises error when config is missing."""
-    from app.compiler.nodes.mcp_server_compiler import MCPServerNodeCompiler
-
     node = FlowNode(
         id="test-invalid",
         type="mcp_server",
@@ -101,7 +91,5 @@ def test_mcp_server_compiler_missing_config():
         position={"x": 0, "y": 0}
     )
 
-    compiler = MCPServerNodeCompiler()
-
     with pytest.raises(ValueError, match="missing mcp_server configuration"):
         compiler.compile(node, context={})
@@ -3,11 +3,11 @@
 from datetime import datetime
 import pytest
 
+from app.services.output_normalizer import OutputEnvelope
+
 
 def test_wrap_basic_output():
     """Test wrapping basic output data."""
-    from app.services.output_normalizer import OutputEnvelope
-
     result = OutputEnvelope.wrap(
         source="firecrawl_scrape",
         data={"content": "test content"},
@@ -24,8 +24,6 @@ def test_wrap_basic_output():
 
 def test_wrap_with_empty_metadata():
     """Test wrapping with no metadata."""
-    from app.services.output_normalizer import OutputEnvelope
-
     result = OutputEnvelope.wrap(
         source="test_source",
         data={"key": "value"}
@@ -35,25 +33,22 @@ def test_wrap_with_empty_metadata():
     assert result["status"] == "success"
 
 
-def test_wrap_timestamp_format():
-    """Test timestamp is ISO 8601 format."""
-    from app.services.output_normalizer import OutputEnvelope
+@pytest.fixture(scope="module")
+def default_envelope():
+    """An envelope with only source/data set, built once for the module."""
+    return OutputEnvelope.wrap(source="test", data={})
 
-    result = OutputEnvelope.wrap(
-        source="test",
-        data={}
-    )
 
-    # Verify timestamp is valid ISO format
-    timestamp = result["timestamp"]
-    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+def test_wrap_timestamp_format(default_envelope):
+    """Test timestamp is ISO 8601 format."""
+    # Verify timestamp is valid, timezone-aware ISO format
+    parsed = datetime.fromisoformat(default_envelope["timestamp"])
     assert isinstance(parsed, datetime)
+    assert parsed.utcoffset() is not None
 
 
 def test_wrap_error_status():
     """Test wrapping error responses."""
-    from app.services.output_normalizer import OutputEnvelope
-
     result = OutputEnvelope.wrap(
         source="api_call",
         data={"error": "API rate limit exceeded"},
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from app.services.python_exporter import PythonExporter
 from app.models.flow import (
@@ -10,11 +12,19 @@ from app.models.flow import (
     InputOutputConfig,
     AgentConfig,
     AgentProvider,
+    KnowledgeBaseConfig,
 )
 
-def test_generate_simple_workflow():
-    """Test generating Python code from simple workflow."""
-    flow = FlowDefinition(
+@pytest.fixture(scope="module")
+def exporter():
+    """generate() resets its per-flow state, so one exporter serves every test."""
+    return PythonExporter()
+
+
+@pytest.fixture(scope="module")
+def simple_flow():
+    """Input -> Agent flow."""
+    return FlowDefinition(
         id="test-flow",
         name="Simple Test",
         description="Input -> Agent -> Output",
@@ -48,9 +58,129 @@ def test_generate_simple_workflow():
         ],
     )
 
-    exporter = PythonExporter()
+
+@pytest.fixture(scope="module")
+def simple_flow_code(exporter, simple_flow):
+    return exporter.generate(simple_flow)
+
+
+def test_generate_simple_workflow(simple_flow_code):
+    """Test generating Python code from simple workflow."""
+    assert "async def run_workflow" in simple_flow_code
+    assert "from agno.agent import Agent" in simple_flow_code
+    assert "gpt-4o" in simple_flow_code
+
+
+def test_topological_sort_orders_branches(exporter):
+    """Nodes come out after all of their upstreams, roots first."""
+    def node(node_id):
+        return FlowNode(
+            id=node_id,
+            type=NodeType.INPUT,
+            position=NodePosition(x=0, y=0),
+            label=node_id,
+            config=NodeConfig(),
+        )
+
+    flow = FlowDefinition(
+        id="diamond",
+        name="Diamond",
+        nodes=[node("d"), node("b"), node("c"), node("a")],
+        edges=[
+            FlowEdge(id="e1", source="a", target="b"),
+            FlowEdge(id="e2", source="a", target="c"),
+            FlowEdge(id="e3", source="b", target="d"),
+            FlowEdge(id="e4", source="c", target="d"),
+        ],
+    )
+
+    order = [n.id for n in exporter._topological_sort(flow)]
+
+    assert order == ["a", "b", "c", "d"]
+
+
+def test_nodes_read_their_upstream_variable(exporter):
+    """Each node consumes its predecessor's variable; roots read user_input."""
+    flow = FlowDefinition(
+        id="chain",
+        name="Chain",
+        nodes=[
+            FlowNode(
+                id="in-1",
+                type=NodeType.INPUT,
+                position=NodePosition(x=0, y=0),
+                label="Input",
+                config=NodeConfig(),
+            ),
+            FlowNode(
+                id="out.1",
+                type=NodeType.OUTPUT,
+                position=NodePosition(x=200, y=0),
+                label="Output",
+                config=NodeConfig(),
+            ),
+        ],
+        edges=[FlowEdge(id="e1", source="in-1", target="out.1")],
+    )
+
     code = exporter.generate(flow)
 
-    assert "async def run_workflow" in code
-    assert "from agno.agent import Agent" in code
-    assert "gpt-4o" in code
+    assert "in_1 = user_input" in code
+    assert "return in_1" in code
+
+
+def test_knowledge_base_sources_load_concurrently(exporter):
+    """Several KB sources are gathered; files go by path, URLs by url."""
+    flow = FlowDefinition(
+        id="kb",
+        name="KB",
+        nodes=[
+            FlowNode(
+                id="kb",
+                type=NodeType.KNOWLEDGE_BASE,
+                position=NodePosition(x=0, y=0),
+                label="Docs",
+                config=NodeConfig(
+                    knowledge_base=KnowledgeBaseConfig(
+                        sources=["/uploads/doc.pdf", "https://python.org"]
+                    )
+                ),
+            ),
+        ],
+        edges=[],
+    )
+
+    code = exporter.generate(flow)
+
+    assert (
+        "    await asyncio.gather(\n"
+        "        kb_kb.add_content_async(path='/uploads/doc.pdf'),\n"
+        "        kb_kb.add_content_async(url='https://python.org'),\n"
+        "    )\n"
+    ) in code
+
+
+@pytest.mark.parametrize("node_type", [NodeType.AGENT, NodeType.CONDITIONAL, NodeType.TEAM])
+def test_skipped_node_passes_input_through(exporter, node_type):
+    """A node that emits no code hands its downstream user_input, not an undefined name."""
+    flow = FlowDefinition(
+        id="skip",
+        name="Skip",
+        nodes=[
+            FlowNode(id="node_in", type=NodeType.INPUT, position=NodePosition(x=0, y=0),
+                     label="Input", config=NodeConfig()),
+            FlowNode(id="node_mid", type=node_type, position=NodePosition(x=200, y=0),
+                     label="Unconfigured", config=NodeConfig()),
+            FlowNode(id="node_out", type=NodeType.OUTPUT, position=NodePosition(x=400, y=0),
+                     label="Output", config=NodeConfig()),
+        ],
+        edges=[
+            FlowEdge(id="e1", source="node_in", target="node_mid"),
+            FlowEdge(id="e2", source="node_mid", target="node_out"),
+        ],
+    )
+
+    namespace = {}
+    exec(exporter.generate(flow), namespace)
+
+    assert asyncio.run(namespace["run_workflow"]("hello")) == "hello"
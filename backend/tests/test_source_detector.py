@@ -3,72 +3,57 @@ import pytest
 from app.services.source_detector import SourceDetector, SourceType
 
 
-def test_detect_file_path():
-    """Local file paths should be detected as FILE."""
-    assert SourceDetector.detect("/path/to/document.pdf") == SourceType.FILE
-    assert SourceDetector.detect("./relative/path/doc.txt") == SourceType.FILE
-    assert SourceDetector.detect("uploads/file.pptx") == SourceType.FILE
-
-
-def test_detect_website_url():
-    """HTTP/HTTPS URLs should be detected as WEBSITE."""
-    assert SourceDetector.detect("https://example.com/page") == SourceType.WEBSITE
-    assert SourceDetector.detect("http://docs.python.org") == SourceType.WEBSITE
-
-
-def test_detect_youtube_url():
-    """YouTube URLs should be detected as YOUTUBE."""
-    assert SourceDetector.detect("https://youtube.com/watch?v=dQw4w9WgXcQ") == SourceType.YOUTUBE
-    assert SourceDetector.detect("https://www.youtube.com/watch?v=abc123") == SourceType.YOUTUBE
-    assert SourceDetector.detect("https://youtu.be/dQw4w9WgXcQ") == SourceType.YOUTUBE
-
-
-def test_detect_invalid_source():
-    """Invalid sources should raise ValueError."""
-    with pytest.raises(ValueError, match="Invalid source"):
-        SourceDetector.detect("")
-
-    with pytest.raises(ValueError, match="Invalid source"):
-        SourceDetector.detect("   ")
-
-
-def test_detect_malformed_url():
-    """Malformed URLs should raise ValueError."""
-    with pytest.raises(ValueError, match="Invalid URL"):
-        SourceDetector.detect("https://")
-
-    with pytest.raises(ValueError, match="Invalid URL"):
-        SourceDetector.detect("http://")
-
-
-def test_detect_youtube_lookalike_domain():
-    """YouTube lookalike domains should be detected as WEBSITE, not YOUTUBE."""
-    assert SourceDetector.detect("https://fake-youtube.com.evil.com") == SourceType.WEBSITE
-    assert SourceDetector.detect("https://notyoutube.com") == SourceType.WEBSITE
-    assert SourceDetector.detect("https://youtube.com.phishing.com") == SourceType.WEBSITE
-
-
-def test_detect_file_with_youtube_in_name():
-    """Local files with 'youtube' in name should be detected as FILE."""
-    assert SourceDetector.detect("/path/youtube.com.txt") == SourceType.FILE
-    assert SourceDetector.detect("./downloads/youtube_video.mp4") == SourceType.FILE
-    assert SourceDetector.detect("youtu.be-backup.pdf") == SourceType.FILE
-
-
-def test_detect_youtube_subdomains():
-    """YouTube subdomains should be detected as YOUTUBE."""
-    assert SourceDetector.detect("https://m.youtube.com/watch?v=abc") == SourceType.YOUTUBE
-    assert SourceDetector.detect("https://music.youtube.com") == SourceType.YOUTUBE
-    assert SourceDetector.detect("https://gaming.youtube.com") == SourceType.YOUTUBE
-
-
-def test_detect_case_insensitive_urls():
-    """URLs should be case-insensitive."""
-    assert SourceDetector.detect("HTTPS://YOUTUBE.COM") == SourceType.YOUTUBE
-    assert SourceDetector.detect("HTTP://EXAMPLE.COM") == SourceType.WEBSITE
-
-
-def test_detect_urls_with_ports():
-    """URLs with ports should be detected correctly."""
-    assert SourceDetector.detect("https://youtube.com:443/watch") == SourceType.YOUTUBE
-    assert SourceDetector.detect("http://example.com:8080") == SourceType.WEBSITE
+CASES = [
+    # Local file paths
+    ("/path/to/document.pdf", SourceType.FILE),
+    ("./relative/path/doc.txt", SourceType.FILE),
+    ("uploads/file.pptx", SourceType.FILE),
+    # Local files with 'youtube' in the name
+    ("/path/youtube.com.txt", SourceType.FILE),
+    ("./downloads/youtube_video.mp4", SourceType.FILE),
+    ("youtu.be-backup.pdf", SourceType.FILE),
+    # HTTP/HTTPS URLs
+    ("https://example.com/page", SourceType.WEBSITE),
+    ("http://docs.python.org", SourceType.WEBSITE),
+    # YouTube URLs
+    ("https://youtube.com/watch?v=dQw4w9WgXcQ", SourceType.YOUTUBE),
+    ("https://www.youtube.com/watch?v=abc123", SourceType.YOUTUBE),
+    ("https://youtu.be/dQw4w9WgXcQ", SourceType.YOUTUBE),
+    # YouTube lookalike domains are plain websites
+    ("https://fake-youtube.com.evil.com", SourceType.WEBSITE),
+    ("https://notyoutube.com", SourceType.WEBSITE),
+    ("https://youtube.com.phishing.com", SourceType.WEBSITE),
+    # YouTube subdomains
+    ("https://m.youtube.com/watch?v=abc", SourceType.YOUTUBE),
+    ("https://music.youtube.com", SourceType.YOUTUBE),
+    ("https://gaming.youtube.com", SourceType.YOUTUBE),
+    # Case-insensitive URLs
+    ("HTTPS://YOUTUBE.COM", SourceType.YOUTUBE),
+    ("HTTP://EXAMPLE.COM", SourceType.WEBSITE),
+    # URLs with ports
+    ("https://youtube.com:443/watch", SourceType.YOUTUBE),
+    ("http://example.com:8080", SourceType.WEBSITE),
+]
+
+
+@pytest.mark.parametrize("source,expected", CASES)
+def test_detect(source, expected):
+    """Each source is classified as FILE, WEBSITE or YOUTUBE."""
+    assert SourceDetector.detect(source) is expected
+
+
+@pytest.mark.parametrize(
+    "source,match",
+    [
+        # Empty sources
+        ("", "Invalid source"),
+        ("   ", "Invalid source"),
+        # URLs without a domain
+        ("https://", "Invalid URL"),
+        ("http://", "Invalid URL"),
+    ],
+)
+def test_detect_invalid_source(source, match):
+    """Empty sources and malformed URLs should raise ValueError."""
+    with pytest.raises(ValueError, match=match):
+        SourceDetector.detect(source)
@@ -1,11 +1,7 @@
 """Tests for the templates API endpoints — verifies routes exist without DB calls."""
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
 
-
-def test_featured_templates_endpoint_exists():
+def test_featured_templates_endpoint_exists(client):
     """GET /api/templates/featured must exist (returns 200 or 500, not 404).
 
     Without the DB migration run, Supabase raises an APIError for the missing
@@ -22,7 +18,7 @@ def test_featured_templates_endpoint_exists():
         )
 
 
-def test_community_templates_endpoint_exists():
+def test_community_templates_endpoint_exists(client):
     """GET /api/templates/community must exist (returns 200 or 500, not 404).
 
     Without the DB migration run, Supabase raises an APIError for the missing
@@ -38,7 +34,7 @@ def test_community_templates_endpoint_exists():
         )
 
 
-def test_use_template_returns_404_for_unknown():
+def test_use_template_returns_404_for_unknown(client):
     """POST /api/templates/{id}/use returns 404 for unknown template, not 405."""
     try:
         response = client.post("/api/templates/nonexistent-id-xyz/use")
@@ -50,7 +46,24 @@ def test_use_template_returns_404_for_unknown():
         )
 
 
-def test_use_template_method_not_get():
+def test_use_template_method_not_get(client):
     """GET /api/templates/{id}/use should return 405 (method not allowed)."""
     response = client.get("/api/templates/some-id/use")
     assert response.status_code == 405, f"Expected 405, got {response.status_code}"
+
+
+def test_use_template_shows_up_in_flow_list(client, fake_supabase):
+    """A flow cloned from a template is listed even right after a cached list"""
+    fake_supabase.tables["flows"] = [{
+        "id": "tpl", "name": "Starter", "description": "", "nodes": [], "edges": [],
+        "metadata": {}, "is_featured": True, "is_public": True,
+        "created_at": "2026-01-01T00:00:00+00:00", "updated_at": "2026-01-01T00:00:00+00:00",
+    }]
+
+    assert len(client.get("/api/flows/").json()) == 1
+
+    response = client.post("/api/templates/tpl/use")
+    assert response.status_code == 200
+    new_id = response.json()["id"]
+
+    assert new_id in {flow["id"] for flow in client.get("/api/flows/").json()}
@@ -137,6 +137,15 @@ class FlowWebSocket {
         }
         break;
 
+      case 'node_output_delta':
+        // Streamed tokens: append to what the node has produced so far
+        if (event.node_id && event.data) {
+          const node = store.nodes.find((n) => n.id === event.node_id);
+          const soFar = node?.data.output ?? '';
+          store.updateNodeStatus(event.node_id, 'running' as NodeStatus, soFar + event.data);
+        }
+        break;
+
       case 'node_complete':
         if (event.node_id) {
           store.updateNodeStatus(event.node_id, 'completed' as NodeStatus);
@@ -151,10 +160,11 @@ class FlowWebSocket {
 
       case 'error':
         if (event.node_id) {
+          // Drop any streamed partial output; the node produced no result
           store.updateNodeStatus(
             event.node_id,
             'error' as NodeStatus,
-            undefined,
+            '',
             event.message,
           );
           toast.error('Node error', event.message ?? 'A node failed during execution');
@@ -7,13 +7,35 @@ Tests the complete workflow:
 2. Save to Supabase via API
 3. Export to Python code via API
 4. Verify generated Python is valid
+
+Runs as a script, or under pytest with RUN_E2E=1 set.
 """
-import requests
+import os
 import sys
 
+import httpx
+import pytest
+
 API_BASE = "http://localhost:8000"
 
+
+def backend_is_up() -> bool:
+    """Quick health probe, so a missing server fails in well under a second."""
+    try:
+        return httpx.get(f"{API_BASE}/health", timeout=0.5).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+@pytest.mark.skipif(not os.getenv("RUN_E2E"), reason="e2e disabled (set RUN_E2E=1)")
 def test_python_export():
+    """Runs the export workflow against a live backend."""
+    if not backend_is_up():
+        pytest.fail(f"Backend not reachable at {API_BASE}")
+    assert run_python_export()
+
+
+def run_python_export():
     """Test complete Python export workflow."""
     print("=" * 60)
     print("PYTHON EXPORT E2E TEST")
@@ -78,70 +100,74 @@ def test_python_export():
     print(f"  Nodes: {len(flow['nodes'])}")
     print(f"  Edges: {len(flow['edges'])}")
 
-    # Step 2: Save flow via API
-    print("\n[2/4] Saving flow to database...")
-    response = requests.post(f"{API_BASE}/api/flows/", json=flow)
-
-    if response.status_code != 201:
-        print(f"✗ Failed to save flow: {response.status_code}")
-        print(f"  Response: {response.text}")
-        return False
-
-    saved_flow = response.json()
-    flow_id = saved_flow["id"]
-    print(f"✓ Flow saved with ID: {flow_id}")
-
-    # Step 3: Export to Python
-    print("\n[3/4] Exporting to Python...")
-    response = requests.get(f"{API_BASE}/api/flows/{flow_id}/export/python")
-
-    if response.status_code != 200:
-        print(f"✗ Failed to export: {response.status_code}")
-        print(f"  Response: {response.text}")
-        return False
-
-    python_code = response.text
-    print(f"✓ Python code generated ({len(python_code)} chars)")
-
-    # Step 4: Verify generated Python
-    print("\n[4/4] Verifying generated Python...")
-
-    # Check essential components
-    checks = [
-        ("Shebang", "#!/usr/bin/env python3" in python_code),
-        ("Docstring", '"""' in python_code and "Python Export Test" in python_code),
-        ("Async function", "async def run_workflow" in python_code),
-        ("Agno import", "from agno import Agent" in python_code),
-        ("Agent config", "gpt-4o-mini" in python_code),
-        ("User input", "user_input" in python_code),
-        ("CLI entrypoint", 'if __name__ == "__main__"' in python_code),
-        ("asyncio.run", "asyncio.run(run_workflow" in python_code),
-    ]
-
-    all_passed = True
-    for check_name, passed in checks:
-        status = "✓" if passed else "✗"
-        print(f"  {status} {check_name}")
-        if not passed:
-            all_passed = False
-
-    # Show generated code preview
-    print("\n" + "=" * 60)
-    print("GENERATED PYTHON CODE (first 50 lines)")
-    print("=" * 60)
-    lines = python_code.split('\n')
-    for i, line in enumerate(lines[:50], 1):
-        print(f"{i:3d} | {line}")
-
-    if len(lines) > 50:
-        print(f"... ({len(lines) - 50} more lines)")
-
-    print("\n" + "=" * 60)
-
-    # Cleanup
-    print("\n[Cleanup] Deleting test flow...")
-    requests.delete(f"{API_BASE}/api/flows/{flow_id}")
-    print("✓ Test flow deleted")
+    # One client for every call, so they share a kept-alive connection
+    with httpx.Client(base_url=API_BASE) as client:
+        # Step 2: Save flow via API
+        print("\n[2/4] Saving flow to database...")
+        response = client.post("/api/flows/", json=flow)
+
+        if response.status_code != 201:
+            print(f"✗ Failed to save flow: {response.status_code}")
+            print(f"  Response: {response.text}")
+            return False
+
+        saved_flow = response.json()
+        flow_id = saved_flow["id"]
+        print(f"✓ Flow saved with ID: {flow_id}")
+
+        # Step 3: Export to Python
+        print("\n[3/4] Exporting to Python...")
+        response = client.get(f"/api/flows/{flow_id}/export/python")
+
+        if response.status_code != 200:
+            print(f"✗ Failed to export: {response.status_code}")
+            print(f"  Response: {response.text}")
+            return False
+
+        python_code = response.text
+        print(f"✓ Python code generated ({len(python_code)} chars)")
+
+        # Step 4: Verify generated Python
+        print("\n[4/4] Verifying generated Python...")
+
+        # Check essential components
+        checks = [
+            ("Shebang", "#!/usr/bin/env python3" in python_code),
+            ("Docstring", '"""' in python_code and "Python Export Test" in python_code),
+            ("Async function", "async def run_workflow" in python_code),
+            ("Agno import", "from agno import Agent" in python_code),
+            ("Agent config", "gpt-4o-mini" in python_code),
+            ("User input", "user_input" in python_code),
+            ("CLI entrypoint", 'if __name__ == "__main__"' in python_code),
+            ("asyncio.run", "asyncio.run(run_workflow" in python_code),
+        ]
+
+        all_passed = True
+        for check_name, passed in checks:
+            status = "✓" if passed else "✗"
+            print(f"  {status} {check_name}")
+            if not passed:
+                all_passed = False
+
+        # Show generated code preview (on request, or when a check failed)
+        if os.getenv("E2E_VERBOSE") or not all_passed:
+            lines = python_code.split('\n')
+            preview = [
+                "",
+                "=" * 60,
+                "GENERATED PYTHON CODE (first 50 lines)",
+                "=" * 60,
+                *(f"{i:3d} | {line}" for i, line in enumerate(lines[:50], 1)),
+            ]
+            if len(lines) > 50:
+                preview.append(f"... ({len(lines) - 50} more lines)")
+            preview += ["", "=" * 60, ""]
+            sys.stdout.write("\n".join(preview))
+
+        # Cleanup
+        print("\n[Cleanup] Deleting test flow...")
+        client.delete(f"/api/flows/{flow_id}")
+        print("✓ Test flow deleted")
 
     # Summary
     print("\n" + "=" * 60)
@@ -163,9 +189,11 @@ if __name__ == "__main__":
     print()
 
     try:
-        success = test_python_export()
+        if not backend_is_up():
+            raise httpx.ConnectError(f"No healthy backend at {API_BASE}")
+        success = run_python_export()
         sys.exit(0 if success else 1)
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("\n✗ ERROR: Cannot connect to backend server")
         print("  Start server: cd backend && uvicorn app.main:app --reload --port 8000")
         sys.exit(1)